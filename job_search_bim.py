@@ -22,12 +22,33 @@ Uso: python job_search_bim.py
 
 import sys
 import os
+import io
 import json
 import csv
+import re
+import html
+import unicodedata
+import gzip
+import base64
+import codecs
+import zlib
+import hashlib
+import random
+import sqlite3
 import xml.etree.ElementTree as ET
-from datetime import datetime
-from urllib.parse import quote_plus
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote_plus, urlparse
+from array import array
+from bisect import bisect_left
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import threading
+import queue
+import functools
+import heapq
+import math
+import time
+import tracemalloc
 import webbrowser
 
 # Dependencias externas
@@ -58,6 +79,16 @@ except ImportError:
     print("📦 Para habilitar logo: pip install Pillow")
     PIL_AVAILABLE = False
 
+# Intentar importar NumPy (opcional para el ranking BM25 vectorizado)
+try:
+    import numpy as np  # type: ignore
+    NUMPY_AVAILABLE = True
+    print("✅ NumPy disponible - Ranking BM25 vectorizado")
+except ImportError:
+    print("⚠️ NumPy no disponible - Ranking BM25 en Python puro")
+    print("📦 Para acelerar el ranking: pip install numpy")
+    NUMPY_AVAILABLE = False
+
 # ============================================================================
 # CONFIGURACIÓN
 # ============================================================================
@@ -198,20 +229,44 @@ SALARY_PREFERENCES = {
     "target_usd": 85000       # ~$7,080 USD/mes - Excelente para remoto global
 }
 
-# Ubicaciones preferidas (Optimizado para búsqueda global)
-PREFERRED_LOCATIONS = [
-    # Remoto y Global
-    "Remote", "Work from Home", "WFH", "Telecommute", "Virtual", "Distributed",
-    # Colombia y LATAM
-    "Colombia", "Bogotá", "Bogota", "Medellín", "Medellin", "Cali", "Barranquilla",
-    "Mexico", "Chile", "Argentina", "Peru", "Ecuador", "Costa Rica", "Panama",
-    "Latinoamérica", "Latin America", "LATAM", "Spanish Speaking",
-    # Mercados Principales
-    "United States", "USA", "Canada", "United Kingdom", "UK", "Europe", "EU",
-    "Australia", "New Zealand", "Germany", "Netherlands", "Spain", "Portugal",
-    # Mercados Emergentes Tech
-    "Singapore", "Dubai", "Israel", "Ireland", "Switzerland", "Denmark", "Sweden"
-]
+# Tabla local de tasas para normalizar salarios a USD (1 unidad de la moneda = X USD)
+CURRENCY_RATES_USD = {
+    "USD": 1.0, "EUR": 1.08, "GBP": 1.27, "CHF": 1.12, "CAD": 0.73, "AUD": 0.66, "NZD": 0.60,
+    "COP": 0.00025, "MXN": 0.055, "BRL": 0.18, "CLP": 0.0011, "ARS": 0.0011, "PEN": 0.27,
+    "INR": 0.012
+}
+
+# Periodos de pago anualizados (jornada completa)
+SALARY_PERIODS_PER_YEAR = {"hour": 2080, "day": 260, "week": 52, "month": 12, "year": 1}
+
+# Ubicaciones preferidas por nivel de prioridad: nivel -> (puntos, ubicaciones canónicas)
+# Los acentos y mayúsculas se ignoran al comparar (Bogotá = bogota)
+PREFERRED_LOCATION_TIERS = {
+    "Remoto y Global": (10, ["Remote", "Virtual", "Distributed"]),
+    "Colombia y LATAM": (8, [
+        "Colombia", "Bogotá", "Medellín", "Cali", "Barranquilla",
+        "Mexico", "Chile", "Argentina", "Peru", "Ecuador", "Costa Rica", "Panama",
+        "Latin America", "Spanish Speaking"
+    ]),
+    "Mercados Principales": (5, [
+        "United States", "Canada", "United Kingdom", "Europe",
+        "Australia", "New Zealand", "Germany", "Netherlands", "Spain", "Portugal"
+    ]),
+    "Mercados Emergentes Tech": (3, [
+        "Singapore", "Dubai", "Israel", "Ireland", "Switzerland", "Denmark", "Sweden"
+    ])
+}
+
+# Alias -> ubicación canónica
+LOCATION_ALIASES = {
+    "Work from Home": "Remote", "WFH": "Remote", "Telecommute": "Remote", "Remoto": "Remote",
+    "Anywhere": "Remote", "Worldwide": "Remote",
+    "Latinoamérica": "Latin America", "LATAM": "Latin America",
+    "México": "Mexico", "CDMX": "Mexico", "Perú": "Peru", "Panamá": "Panama",
+    "USA": "United States", "US": "United States", "U.S.": "United States", "Estados Unidos": "United States",
+    "UK": "United Kingdom", "EU": "Europe", "Europa": "Europe",
+    "España": "Spain", "Deutschland": "Germany", "Alemania": "Germany", "UAE": "Dubai"
+}
 
 # APIs habilitadas - Ampliado
 ENABLED_APIS = {
@@ -222,6 +277,97 @@ ENABLED_APIS = {
     "adzuna": False        # Para futuras integraciones
 }
 
+# Puntos fijos por fuente en el ranking (job["source"] -> puntos)
+SOURCE_SCORE_PRIORS = {
+    "RemoteOK": 0,
+    "The Muse": 0
+}
+
+# Clases de palabra clave que activan enlaces especializados (subcadenas en minúsculas)
+SEARCH_LINK_KEYWORD_CLASSES = {
+    "bim": ("bim", "revit", "autocad", "civil", "tekla", "navisworks", "engineer", "cad"),
+    "tech": ("software", "developer", "engineer", "python", "javascript", "tech", "programming", "c#", "dynamo"),
+    "gis": ("gis", "arcgis", "qgis", "data", "analyst", "power bi", "spatial")
+}
+
+# Plantillas de enlaces de búsqueda: {keyword} = texto original, {query} = texto codificado para URL
+# "class" None = siempre; si no, solo para palabras clave de esa clase
+SEARCH_LINK_TEMPLATES = [
+    # LinkedIn - ÚLTIMAS 72 HORAS
+    {"group": "linkedin", "class": None, "source": "LinkedIn (Remote)", "company": "LinkedIn Jobs",
+     "location": "Remote Worldwide", "score": 90, "posted_date": "Últimas 72 horas",
+     "title": "LinkedIn: {keyword} (Remote - Últimas 72h)",
+     "description": "Búsqueda en LinkedIn para '{keyword}' - Solo empleos remotos de las ÚLTIMAS 72 HORAS.",
+     "url": "https://www.linkedin.com/jobs/search/?keywords={query}&location=Worldwide&f_WT=2&f_TPR=r259200"},
+    {"group": "linkedin", "class": None, "source": "LinkedIn", "company": "LinkedIn Jobs",
+     "location": "United States", "score": 85, "posted_date": "Últimas 72 horas",
+     "title": "LinkedIn: {keyword} (United States - Últimas 72h)",
+     "description": "Búsqueda en LinkedIn para '{keyword}' en United States - ÚLTIMAS 72 HORAS.",
+     "url": "https://www.linkedin.com/jobs/search/?keywords={query}&location=United+States&f_TPR=r259200"},
+    {"group": "linkedin", "class": None, "source": "LinkedIn", "company": "LinkedIn Jobs",
+     "location": "Canada", "score": 85, "posted_date": "Últimas 72 horas",
+     "title": "LinkedIn: {keyword} (Canada - Últimas 72h)",
+     "description": "Búsqueda en LinkedIn para '{keyword}' en Canada - ÚLTIMAS 72 HORAS.",
+     "url": "https://www.linkedin.com/jobs/search/?keywords={query}&location=Canada&f_TPR=r259200"},
+    # Indeed - ÚLTIMOS 3 DÍAS
+    {"group": "indeed", "class": None, "source": "Indeed (Remote)", "company": "Indeed Jobs",
+     "location": "Remote", "score": 85, "posted_date": "Últimos 3 días",
+     "title": "Indeed: {keyword} (Remote - Últimos 3 días)",
+     "description": "Búsqueda en Indeed para '{keyword}' - Empleos remotos, ÚLTIMOS 3 DÍAS.",
+     "url": "https://www.indeed.com/jobs?q={query}&l=Remote&fromage=3&sort=date"},
+    {"group": "indeed", "class": None, "source": "Indeed (Salary)", "company": "Indeed Jobs",
+     "location": "Any", "score": 80, "posted_date": "Últimos 3 días", "salary_min": 50000,
+     "title": "Indeed: {keyword} ($50K+ - Últimos 3 días)",
+     "description": "Búsqueda en Indeed para '{keyword}' - Salario mínimo $50,000, ÚLTIMOS 3 DÍAS.",
+     "url": "https://www.indeed.com/jobs?q={query}&l=&fromage=3&sort=date&salary=%2450%2C000"},
+    # Sitios especializados
+    {"group": "specialized", "class": None, "source": "WeWorkRemotely", "company": "We Work Remotely",
+     "location": "Remote Global", "score": 55,
+     "title": "We Work Remotely: {keyword}",
+     "description": "Mayor sitio de empleos remotos para '{keyword}'.",
+     "url": "https://weworkremotely.com/remote-jobs/search?term={query}"},
+    {"group": "specialized", "class": "bim", "source": "Indeed Colombia", "company": "Indeed Colombia",
+     "location": "Colombia", "score": 85,
+     "title": "Indeed Colombia: {keyword} (Últimos 3 días)",
+     "description": "Empleos en Colombia para '{keyword}' - ÚLTIMOS 3 DÍAS.",
+     "url": "https://co.indeed.com/jobs?q={query}&l=Colombia&fromage=3&sort=date"},
+    {"group": "specialized", "class": "bim", "source": "LinkedIn Colombia", "company": "LinkedIn Colombia",
+     "location": "Colombia", "score": 90,
+     "title": "LinkedIn Colombia: {keyword} (Últimas 72h)",
+     "description": "Red profesional en Colombia para '{keyword}' - ÚLTIMAS 72 HORAS.",
+     "url": "https://www.linkedin.com/jobs/search/?keywords={query}&location=Colombia&f_TPR=r259200"},
+    {"group": "specialized", "class": "bim", "source": "ElEmpleo Colombia", "company": "ElEmpleo Colombia",
+     "location": "Colombia", "score": 95,
+     "title": "ElEmpleo Colombia: {keyword} (Recientes)",
+     "description": "Principal sitio de empleos en Colombia para '{keyword}' - VACANTES RECIENTES.",
+     "url": "https://www.elempleo.com/co/ofertas-empleo?q={query}&l=Colombia"},
+    {"group": "specialized", "class": "tech", "source": "AngelList", "company": "AngelList (Startups)",
+     "location": "Global", "score": 60,
+     "title": "AngelList: {keyword}",
+     "description": "Empleos en startups para '{keyword}'.",
+     "url": "https://angel.co/jobs#find/f!%7B%22keywords%22%3A%5B%22{query}%22%5D%7D"},
+    {"group": "specialized", "class": "tech", "source": "StackOverflow", "company": "Stack Overflow",
+     "location": "Global", "score": 65,
+     "title": "Stack Overflow Jobs: {keyword}",
+     "description": "Empleos técnicos para '{keyword}'.",
+     "url": "https://stackoverflow.com/jobs?q={query}&r=true"},
+    {"group": "specialized", "class": "gis", "source": "GIS Jobs", "company": "GIS Jobs Clearinghouse",
+     "location": "Global", "score": 70,
+     "title": "GIS Jobs: {keyword}",
+     "description": "Empleos especializados en GIS para '{keyword}'.",
+     "url": "https://www.gjc.org/jobs/search?query={query}"},
+    {"group": "specialized", "class": None, "source": "ElEmpleo Colombia", "company": "ElEmpleo Colombia",
+     "location": "Colombia", "score": 80,
+     "title": "ElEmpleo.com: {keyword}",
+     "description": "Principal sitio de empleos en Colombia para '{keyword}'.",
+     "url": "https://www.elempleo.com/co/ofertas-empleo?q={query}&l=Colombia"},
+    {"group": "specialized", "class": None, "source": "Computrabajo", "company": "Computrabajo",
+     "location": "Colombia", "score": 75,
+     "title": "Computrabajo Colombia: {keyword}",
+     "description": "Empleos en Colombia y LATAM para '{keyword}'.",
+     "url": "https://www.computrabajo.com.co/trabajo-de-{query}-en-colombia"}
+]
+
 # Filtros de búsqueda optimizados - Actualizado 2025
 SEARCH_FILTERS = {
     "remote_only": False,           # Incluir tanto remotos como presenciales
@@ -236,315 +382,2724 @@ SEARCH_FILTERS = {
     "include_freelance": True       # Incluir trabajos freelance
 }
 
+# Parámetros del motor de búsqueda (rendimiento)
+ENGINE_SETTINGS = {
+    "feed_snapshot_ttl_seconds": 900,   # Reutilizar cada feed descargado 15 min (None = una vez por ejecución)
+    "remoteok_max_age_days": 7,         # Antigüedad máxima de los empleos de RemoteOK
+    "remoteok_streaming": True,         # Decodificar el feed de RemoteOK a medida que llega
+    "stream_chunk_bytes": 64 * 1024,    # Tamaño de bloque al leer respuestas en streaming
+    "max_indexed_description_chars": 20000,  # Descripción normalizada máxima por empleo
+    "bm25_k1": 1.2,                     # Saturación de frecuencia de término (BM25)
+    "bm25_b": 0.75,                     # Normalización por longitud de campo (BM25)
+    "bm25_weight": 10,                  # Puntos de score por unidad de BM25
+    "top_k": 20,                        # Empleos que se mantienen ordenados (el resto se ordena al paginar)
+    "near_duplicate_threshold": 0.8,    # Similitud Jaccard estimada para fusionar casi-duplicados (0 = desactivado)
+    "minhash_permutations": 64,         # Tamaño de la firma MinHash
+    "minhash_max_tokens": 300,          # Tokens de cada empleo usados para los shingles
+    "near_duplicate_title_threshold": 0.5,  # Jaccard mínima entre tokens de título para fusionar
+    "themuse_first_page": 0,            # Primera página del endpoint público de The Muse
+    "themuse_max_pages": 20,            # Páginas máximas a recorrer por snapshot
+    "max_workers": 8,                   # Búsquedas de palabras clave en paralelo
+    "pipeline_max_in_flight": 16,       # Consultas pendientes como máximo en el pipeline en streaming
+    "max_per_host": 4,                  # Conexiones simultáneas máximas por host
+    "request_timeout": 10               # Segundos máximos por petición HTTP
+}
+
+# Límites y tolerancia a fallos por fuente (claves de ENABLED_APIS)
+SOURCE_LIMITS = {
+    "default": {
+        "rate_per_second": 2.0,     # Peticiones sostenidas por segundo (token bucket)
+        "burst": 4,                 # Ráfaga máxima de peticiones
+        "max_retries": 3,           # Reintentos ante 429/5xx o errores de red
+        "backoff_base": 1.0,        # Segundos del primer reintento (exponencial con jitter)
+        "backoff_max": 30.0,        # Espera máxima entre reintentos
+        "failure_threshold": 2      # Fallos seguidos que abren el circuito durante el barrido
+    },
+    "remoteok": {"rate_per_second": 0.5, "burst": 1},
+    "themuse": {"rate_per_second": 2.0, "burst": 4}
+}
+
+# Directorio de datos locales (caché, historial)
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".jobsearchbim")
+
+# Registro de empleos ya vistos (modo incremental "solo nuevos")
+SEEN_STORE_SETTINGS = {
+    "path": os.path.join(DATA_DIR, "seen_jobs"),    # Se crean seen_jobs.json y seen_jobs.txt
+    "bloom_capacity": 200000,           # Empleos esperados antes de degradar el filtro
+    "bloom_error_rate": 0.01            # Tasa de falsos positivos del filtro Bloom
+}
+
+# Almacén SQLite de empleos y ejecuciones (búsqueda de texto completo con FTS5)
+JOB_STORE_SETTINGS = {
+    "enabled": True,
+    "path": os.path.join(DATA_DIR, "jobs.sqlite3"),
+    "batch_size": 500,                  # Empleos por transacción al guardar
+    "max_body_chars": 5000              # Texto de descripción indexado por empleo
+}
+
+# Caché HTTP en disco
+HTTP_CACHE_SETTINGS = {
+    "enabled": True,
+    "directory": os.path.join(DATA_DIR, "http_cache"),
+    "max_bytes": 50 * 1024 * 1024,      # Tamaño máximo en disco (LRU)
+    "default_ttl_seconds": 600,         # Vigencia por defecto de una respuesta
+    "ttl_by_host": {                    # Vigencia por fuente
+        "remoteok.io": 900,
+        "www.themuse.com": 1800
+    }
+}
+
 # ============================================================================
-# MOTOR DE BÚSQUEDA
+# CACHÉ HTTP EN DISCO
 # ============================================================================
 
-class JobSearchEngine:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+class HttpResponseCache:
+    """Caché de respuestas HTTP en disco (gzip) con TTL por host, revalidación y desalojo LRU"""
+
+    def __init__(self, directory, max_bytes, default_ttl, ttl_by_host=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_by_host = ttl_by_host or {}
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return f"{base}.json", f"{base}.gz"
+
+    def record(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def ttl_for(self, url):
+        """Vigencia configurada para el host de la URL"""
+        return self.ttl_by_host.get(urlparse(url).netloc, self.default_ttl)
+
+    def lookup(self, url):
+        """Devuelve los metadatos guardados para la URL o None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if os.path.exists(body_path) else None
+
+    def is_fresh(self, url, meta):
+        """Indica si una entrada sigue dentro de su TTL"""
+        return (time.time() - meta.get("stored_at", 0)) < self.ttl_for(url)
+
+    def load(self, url, meta):
+        """Reconstruye una respuesta a partir de la entrada guardada"""
+        meta_path, body_path = self._paths(url)
+        with gzip.open(body_path, "rb") as f:
+            body = f.read()
+        os.utime(body_path)  # Marca de uso reciente para el LRU
+        
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = requests.structures.CaseInsensitiveDict(meta.get("headers", {}))
+        response.encoding = meta.get("encoding")
+        response._content = body
+        response._content_consumed = True  # Permite iter_content sobre el cuerpo en memoria
+        response.from_cache = True
+        return response
+
+    def store(self, url, response):
+        """Guarda una respuesta 200 comprimida junto con sus validadores"""
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        body_path = self._paths(url)[1]
+        tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(response.content)
+        self._commit(url, response, tmp_path)
+
+    def tee(self, url, response):
+        """Envuelve iter_content de una respuesta en streaming para guardarla mientras se consume
+
+        Solo se guarda si el cuerpo se lee completo; los bloques se entregan siempre como bytes.
+        """
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return response
+        original_iter_content = response.iter_content
+        tmp_path = f"{self._paths(url)[1]}.{threading.get_ident()}.tmp"
+        
+        def iter_content(chunk_size=1, decode_unicode=False):
+            complete = False
+            try:
+                with gzip.open(tmp_path, "wb") as f:
+                    for chunk in original_iter_content(chunk_size):
+                        f.write(chunk)
+                        yield chunk
+                complete = True
+                self._commit(url, response, tmp_path)
+            finally:
+                if not complete and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        
+        response.iter_content = iter_content
+        return response
+
+    def _commit(self, url, response, tmp_body_path):
+        """Publica un cuerpo ya comprimido y sus metadatos de forma atómica"""
+        meta_path, body_path = self._paths(url)
+        headers = {name: response.headers[name] for name in ("Content-Type", "ETag", "Last-Modified") if name in response.headers}
+        meta = {"url": url, "stored_at": time.time(), "headers": headers, "encoding": response.encoding}
+        
+        os.replace(tmp_body_path, body_path)
+        self._write_meta(meta_path, meta)
+        self.record("stores")
+        self._evict()
+
+    def mark_revalidated(self, url, meta):
+        """Renueva el TTL de una entrada confirmada con 304 Not Modified"""
+        meta["stored_at"] = time.time()
+        self._write_meta(self._paths(url)[0], meta)
+        self.record("revalidated")
+
+    def _write_meta(self, meta_path, meta):
+        with open(f"{meta_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+    def _evict(self):
+        """Elimina las entradas usadas hace más tiempo hasta respetar max_bytes"""
+        with self._lock:
+            bodies = []
+            for name in os.listdir(self.directory):
+                if name.endswith(".gz"):
+                    path = os.path.join(self.directory, name)
+                    stat = os.stat(path)
+                    bodies.append((stat.st_mtime, stat.st_size, path))
+            
+            total = sum(size for _, size, _ in bodies)
+            for _, size, path in sorted(bodies):
+                if total <= self.max_bytes:
+                    break
+                for stale in (path, f"{path[:-3]}.json"):
+                    try:
+                        os.remove(stale)
+                    except OSError:
+                        pass
+                total -= size
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        """Vacía la caché en disco"""
+        with self._lock:
+            for name in os.listdir(self.directory):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+class CachedSession(requests.Session):
+    """Sesión de requests que resuelve los GET desde HttpResponseCache cuando es posible"""
+
+    def __init__(self, cache=None):
+        super().__init__()
+        self.cache = cache
+
+    def get(self, url, **kwargs):
+        if self.cache is None:
+            return super().get(url, **kwargs)
+        
+        if kwargs.get("params"):
+            url = requests.Request("GET", url, params=kwargs.pop("params")).prepare().url
+        
+        try:
+            meta = self.cache.lookup(url)
+            if meta and self.cache.is_fresh(url, meta):
+                response = self.cache.load(url, meta)
+                self.cache.record("hits")
+                return response
+        except OSError as e:
+            print(f"⚠️ Error leyendo caché HTTP: {e}")
+            meta = None
+        
+        # Revalidación condicional con los validadores guardados
+        headers = dict(kwargs.pop("headers", None) or {})
+        if meta:
+            cached_headers = meta.get("headers", {})
+            if "ETag" in cached_headers:
+                headers["If-None-Match"] = cached_headers["ETag"]
+            if "Last-Modified" in cached_headers:
+                headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+        
+        response = super().get(url, headers=headers, **kwargs)
+        
+        try:
+            if response.status_code == 304 and meta:
+                self.cache.mark_revalidated(url, meta)
+                return self.cache.load(url, meta)
+            
+            self.cache.record("misses")
+            if response.status_code == 200:
+                if kwargs.get("stream"):
+                    self.cache.tee(url, response)
+                else:
+                    self.cache.store(url, response)
+        except OSError as e:
+            print(f"⚠️ Error escribiendo caché HTTP: {e}")
+        
+        return response
+
+# ============================================================================
+# TOLERANCIA A FALLOS POR FUENTE
+# ============================================================================
+
+class SourceUnavailableError(Exception):
+    """La fuente tiene el circuito abierto y no se consulta en este barrido"""
+
+
+class TokenBucket:
+    """Limitador de tasa tipo token bucket (bloquea hasta que hay un token disponible)"""
+
+    def __init__(self, rate_per_second, capacity):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Consume un token y devuelve los segundos que hubo que esperar"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            
+            wait = 0.0
+            if self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate
+                time.sleep(wait)
+                self.updated_at = time.monotonic()
+                self.tokens = 1.0
+            self.tokens -= 1
+            return wait
+
+
+class CircuitBreaker:
+    """Deja de llamar a una fuente tras varios fallos seguidos hasta que se reinicia"""
+
+    def __init__(self, failure_threshold):
+        self.failure_threshold = failure_threshold
+        self.consecutive_failures = 0
+        self.is_open = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        return not self.is_open
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                self.is_open = True
+
+    def reset(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.is_open = False
+
+
+class SourceGuard:
+    """Rate limiting, reintentos con backoff y circuit breaker para una fuente"""
+
+    def __init__(self, name, limits):
+        self.name = name
+        self.limits = limits
+        self.bucket = TokenBucket(limits["rate_per_second"], limits["burst"])
+        self.breaker = CircuitBreaker(limits["failure_threshold"])
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "rejected": 0, "throttled_seconds": 0.0}
+        self._lock = threading.Lock()
+
+    def record(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _backoff(self, attempt, retry_after=None):
+        """Espera exponencial con jitter completo, respetando Retry-After si el servidor lo envía"""
+        if retry_after is not None:
+            return min(retry_after, self.limits["backoff_max"])
+        ceiling = min(self.limits["backoff_max"], self.limits["backoff_base"] * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def execute(self, request):
+        """Ejecuta request() aplicando límites; reintenta ante 429/5xx y errores de red"""
+        if not self.breaker.allow():
+            self.record("rejected")
+            raise SourceUnavailableError(f"{self.name}: circuito abierto")
+        
+        max_retries = self.limits["max_retries"]
+        for attempt in range(max_retries + 1):
+            self.record("throttled_seconds", self.bucket.acquire())
+            self.record("requests")
+            
+            retry_after = None
+            try:
+                response = request()
+            except requests.RequestException as e:
+                error = e
+            else:
+                if response.status_code != 429 and response.status_code < 500:
+                    self.breaker.record_success()
+                    return response
+                error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+                response.close()  # Libera la conexión (y el hueco del host) antes de reintentar
+                try:
+                    retry_after = float(response.headers.get("Retry-After", ""))
+                except ValueError:
+                    retry_after = None
+            
+            if attempt < max_retries:
+                self.record("retries")
+                time.sleep(self._backoff(attempt, retry_after))
+        
+        self.record("failures")
+        self.breaker.record_failure()
+        raise error
+
+    def summary(self):
+        """Contadores de la fuente junto con el estado del circuito"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["circuit"] = "abierto" if self.breaker.is_open else "cerrado"
+        return stats
+
+# ============================================================================
+# SNAPSHOTS DE FEEDS
+# ============================================================================
+
+class FeedSnapshot:
+    """Copia en memoria de un feed completo, descargada una sola vez por TTL"""
+
+    def __init__(self, name, loader, ttl_seconds=None, indexer=None):
+        self.name = name
+        self.loader = loader
+        self.indexer = indexer          # Índice opcional calculado una vez por descarga
+        self.ttl_seconds = ttl_seconds  # None = válido durante toda la ejecución
+        self.jobs = None
+        self.index = None
+        self.fetched_at = 0.0
+        self.fetch_count = 0
+        self._lock = threading.Lock()
+
+    def is_fresh(self):
+        """Indica si el snapshot cargado sigue vigente"""
+        if self.jobs is None:
+            return False
+        if self.ttl_seconds is None:
+            return True
+        return (time.monotonic() - self.fetched_at) < self.ttl_seconds
+
+    def get(self):
+        """Devuelve los empleos del feed, descargándolo solo si el snapshot expiró"""
+        return self.get_indexed()[0]
+
+    def get_indexed(self):
+        """Devuelve (empleos, índice) de la misma descarga"""
+        with self._lock:
+            if not self.is_fresh():
+                jobs = self.loader()
+                self.index = self.indexer(jobs) if self.indexer else None
+                self.jobs = jobs
+                self.fetched_at = time.monotonic()
+                self.fetch_count += 1
+                print(f"  📥 Snapshot {self.name}: {len(self.jobs)} empleos en memoria")
+            return self.jobs, self.index
+
+    def invalidate(self):
+        """Fuerza una nueva descarga en el próximo acceso"""
+        with self._lock:
+            self.jobs = None
+            self.index = None
+            self.fetched_at = 0.0
+
+# ============================================================================
+# REGISTRO DE EMPLEOS VISTOS
+# ============================================================================
+
+def parse_iso_date(value):
+    """Convierte una fecha ISO 8601 ('...Z') en datetime con zona horaria"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def job_fingerprint(job):
+    """Huella estable de un empleo: fuente + URL (o título-empresa si no hay URL)"""
+    identity = job.get("url") or f"{job.get('title', '')}-{job.get('company', '')}"
+    raw = f"{job.get('source', '')}|{identity}".lower()
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+class BloomFilter:
+    """Filtro Bloom: descarta en O(k) las huellas que seguro no se han visto"""
+
+    def __init__(self, capacity, error_rate, bits=None):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def dump(self):
+        return base64.b64encode(zlib.compress(bytes(self.bits))).decode("ascii")
+
+    @classmethod
+    def load(cls, capacity, error_rate, data):
+        """Filtro guardado con dump, o None si se guardó con otra capacidad/tasa de error"""
+        bloom = cls(capacity, error_rate)
+        bits = bytearray(zlib.decompress(base64.b64decode(data)))
+        if len(bits) != len(bloom.bits):
+            return None
+        bloom.bits = bits
+        return bloom
+
+
+class SeenJobStore:
+    """Huellas de empleos ya mostrados y marcas de agua por fuente, persistidas entre ejecuciones
+
+    seen_jobs.json guarda el filtro Bloom y las marcas de agua; seen_jobs.txt las huellas
+    exactas (una por línea), que solo se leen cuando el filtro Bloom da un posible positivo.
+    """
+
+    def __init__(self, path, capacity=200000, error_rate=0.01):
+        self.header_path = f"{path}.json"
+        self.fingerprints_path = f"{path}.txt"
+        self.high_water_marks = {}
+        self.bloom = None
+        self._seen = None                   # Carga perezosa de seen_jobs.txt
+        self._pending = []
+        self._pending_marks = {}
+        self._lock = threading.Lock()
+        
+        try:
+            with open(self.header_path, "r", encoding="utf-8") as f:
+                header = json.load(f)
+            self.bloom = BloomFilter.load(capacity, error_rate, header["bloom"])
+            self.high_water_marks = header.get("high_water_marks", {})
+        except (OSError, ValueError, KeyError, zlib.error):
+            pass
+        
+        # Sin filtro guardado (o con otro tamaño): se reconstruye desde las huellas exactas,
+        # si no todos los empleos ya vistos volverían a aparecer como nuevos
+        if self.bloom is None:
+            self.bloom = BloomFilter(capacity, error_rate)
+            for fingerprint in self._load_fingerprints():
+                self.bloom.add(fingerprint)
+
+    def _load_fingerprints(self):
+        if self._seen is None:
+            try:
+                with open(self.fingerprints_path, "r", encoding="utf-8") as f:
+                    self._seen = {line.strip() for line in f if line.strip()}
+            except OSError:
+                self._seen = set()
+            self._seen.update(self._pending)  # Añadidas en esta ejecución y aún sin guardar
+        return self._seen
+
+    def is_seen(self, fingerprint):
+        """Consulta el filtro Bloom y, solo si responde 'quizá', el conjunto exacto"""
+        if fingerprint not in self.bloom:
+            return False
+        return fingerprint in self._load_fingerprints()
+
+    def add(self, fingerprint):
+        """Marca una huella como vista (se persiste con save)"""
+        self.bloom.add(fingerprint)
+        if self._seen is not None:
+            self._seen.add(fingerprint)
+        self._pending.append(fingerprint)
+
+    def high_water_mark(self, source):
+        """Marca temporal del empleo más reciente visto de la fuente en ejecuciones anteriores"""
+        return self.high_water_marks.get(source)
+
+    def propose_high_water_mark(self, source, value):
+        """Registra la marca más reciente de esta ejecución (se aplica con save)"""
+        with self._lock:
+            if value is not None and value > self._pending_marks.get(source, float("-inf")):
+                self._pending_marks[source] = value
+
+    def save(self):
+        """Persiste las huellas nuevas y las marcas de agua de esta ejecución"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.header_path) or ".", exist_ok=True)
+            if self._pending:
+                with open(self.fingerprints_path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(self._pending) + "\n")
+                self._pending = []
+            
+            for source, value in self._pending_marks.items():
+                if value > self.high_water_marks.get(source, float("-inf")):
+                    self.high_water_marks[source] = value
+            self._pending_marks = {}
+            
+            header = {"version": 1, "bloom": self.bloom.dump(), "high_water_marks": self.high_water_marks}
+            with open(f"{self.header_path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(header, f)
+            os.replace(f"{self.header_path}.tmp", self.header_path)
+
+# ============================================================================
+# REGISTRO COMPACTO DE EMPLEOS
+# ============================================================================
+
+class JobRecord:
+    """Empleo normalizado con __slots__ (sin __dict__ por instancia) y vista compatible con dict
+
+    Los bucles calientes (filtros, ranking) leen atributos directamente (job.salary_min); la GUI y
+    los exportadores siguen usando job["title"], job.get(...), items() o export_view(job).
+    Fuente, empresa y ubicación se internan: miles de empleos comparten la misma cadena.
+    Las claves fuera de FIELDS/OPTIONAL van a un dict auxiliar que solo se crea si hace falta.
+    """
+
+    FIELDS = ("title", "company", "location", "salary_min", "salary_max", "url", "description", "source", "score")
+    OPTIONAL = ("categories", "_text", "_terms", "_minhash", "_posted_at", "_score_parts", "_duplicate_urls",
+                "_salary_estimate")
+    __slots__ = FIELDS + OPTIONAL + ("_extra",)
+    _SLOTS = frozenset(FIELDS + OPTIONAL)
+
+    def __init__(self, title="N/A", company="N/A", location="", salary_min=0, salary_max=0,
+                 url="", description="", source="", score=0, **extra):
+        self.title = title
+        self.company = sys.intern(company) if type(company) is str else company
+        self.location = sys.intern(location) if type(location) is str else location
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.url = url
+        self.description = description
+        self.source = sys.intern(source) if type(source) is str else source
+        self.score = score
+        self._extra = None
+        for key, value in extra.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, job):
+        """Registro nuevo con las claves de un dict (o de otro registro)"""
+        fields = {key: job[key] for key in cls.FIELDS if key in job}
+        record = cls(**fields)
+        for key, value in job.items():
+            if key not in fields:
+                record[key] = value
+        return record
+
+    def __getitem__(self, key):
+        if key in self._SLOTS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._SLOTS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._SLOTS and hasattr(self, key):
+            delattr(self, key)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self._SLOTS:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        if key in self._SLOTS:
+            return getattr(self, key, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+            return default
+        return self[key]
+
+    def update(self, other=(), **kwargs):
+        items = other.items() if hasattr(other, "items") else other
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def keys(self):
+        keys = [key for key in self.FIELDS + self.OPTIONAL if hasattr(self, key)]
+        if self._extra:
+            keys.extend(self._extra)
+        return keys
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def copy(self):
+        """Copia superficial (cada búsqueda puntúa su propio registro sin tocar el del snapshot)"""
+        clone = JobRecord.__new__(JobRecord)
+        for key in self.FIELDS + self.OPTIONAL:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                setattr(clone, key, value)
+        clone._extra = dict(self._extra) if self._extra else None
+        return clone
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"JobRecord({export_view(self)!r})"
+
+
+_MISSING = object()
+
+
+def as_job_record(job):
+    """El mismo registro si ya es JobRecord; si es un dict, un JobRecord con sus claves"""
+    return job if type(job) is JobRecord else JobRecord.from_dict(job)
+
+# ============================================================================
+# TEXTO NORMALIZADO
+# ============================================================================
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Campos de búsqueda precalculados una vez por empleo (minúsculas, sin acentos ni HTML)
+NormalizedText = namedtuple("NormalizedText", ["title", "company", "location", "description", "tokens", "lengths"])
+
+
+def fold_text(value, strip_html=False):
+    """Minúsculas sin acentos (Bogotá -> bogota), opcionalmente sin etiquetas HTML"""
+    text = str(value or "")
+    if strip_html and "<" in text:
+        text = html.unescape(_HTML_TAG_RE.sub(" ", text))
+    elif strip_html and "&" in text:
+        text = html.unescape(text)
+    if not text.isascii():
+        text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+    return _WHITESPACE_RE.sub(" ", text).casefold().strip()
+
+
+def build_normalized_text(title, company, location, description):
+    """Calcula los campos normalizados y el conjunto de tokens de un empleo"""
+    max_chars = ENGINE_SETTINGS.get("max_indexed_description_chars", 20000)
+    title = fold_text(title)
+    company = fold_text(company)
+    location = fold_text(location)
+    description = fold_text(str(description or "")[:max_chars], strip_html=True)
     
-    def search_jobs(self, keyword):
-        """Busca empleos para una palabra clave específica - OPTIMIZADO PARA ÚLTIMAS VACANTES"""
-        print(f"🔍 Buscando ÚLTIMAS VACANTES para: '{keyword}'")
-        results = []
+    field_tokens = [_TOKEN_RE.findall(text) for text in (title, company, location, description)]
+    tokens = frozenset(token for found in field_tokens for token in found)
+    lengths = (len(field_tokens[0]), len(field_tokens[1]), len(field_tokens[3]))  # título, empresa, descripción
+    return NormalizedText(title, company, location, description, tokens, lengths)
+
+
+def get_normalized_text(job):
+    """Campos normalizados del empleo; se calculan y guardan en '_text' la primera vez"""
+    folded = job.get("_text")
+    if folded is None:
+        folded = build_normalized_text(job.get("title", ""), job.get("company", ""),
+                                       job.get("location", ""), job.get("description", ""))
+        job["_text"] = folded
+    return folded
+
+
+def export_view(job):
+    """Copia del empleo sin los campos internos ('_...') para exportar"""
+    return {key: value for key, value in job.items() if not key.startswith("_")}
+
+# ============================================================================
+# COINCIDENCIA MULTIPATRÓN
+# ============================================================================
+
+class KeywordMatcher:
+    """Autómata Aho-Corasick (compilado a DFA) que encuentra todos los términos en una sola pasada
+
+    Por defecto conserva la semántica de subcadena de `term in text`; con whole_words=True solo
+    cuenta apariciones como palabra completa ("cto" no coincide dentro de "director"). Los textos
+    deben venir normalizados con fold_text (los términos se normalizan igual).
+    """
+
+    def __init__(self, terms, whole_words=False):
+        self.terms = list(dict.fromkeys(fold_text(term) for term in terms if term))
+        self.term_ids = {term: i for i, term in enumerate(self.terms)}
+        self.whole_words = whole_words
+        
+        # Trie de términos
+        goto = [{}]
+        outputs = [[]]
+        for term_id, term in enumerate(self.terms):
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = next_state
+                state = next_state
+            outputs[state].append(term_id)
+        
+        # Enlaces de fallo en anchura, resueltos directamente en la tabla de transiciones
+        fail = [0] * len(goto)
+        self._delta = [None] * len(goto)
+        self._delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions = dict(self._delta[fail[state]])
+            transitions.update(goto[state])
+            self._delta[state] = transitions
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, next_state in goto[state].items():
+                if state:
+                    fail[next_state] = self._delta[fail[state]].get(char, 0)
+                queue.append(next_state)
+        self._outputs = [tuple(found) if found else None for found in outputs]
+
+    def scan(self, text):
+        """Índices de todos los términos contenidos en text"""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        found = set()
+        for end, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                if self.whole_words:
+                    found.update(term_id for term_id in outputs[state] if self._is_whole_word(text, end, term_id))
+                else:
+                    found.update(outputs[state])
+        return found
+
+    def count(self, text):
+        """{índice de término: apariciones} en text (incluye apariciones solapadas)"""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        counts = {}
+        for end, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                for term_id in outputs[state]:
+                    if not self.whole_words or self._is_whole_word(text, end, term_id):
+                        counts[term_id] = counts.get(term_id, 0) + 1
+        return counts
+
+    def _is_whole_word(self, text, end, term_id):
+        """La aparición que termina en text[end] no continúa una palabra por ninguno de sus lados
+
+        Solo se exige límite en los extremos alfanuméricos del término (".net" coincide en "asp.net").
+        """
+        term = self.terms[term_id]
+        start = end - len(term) + 1
+        if term[0].isalnum() and start > 0 and text[start - 1].isalnum():
+            return False
+        if term[-1].isalnum() and end + 1 < len(text) and text[end + 1].isalnum():
+            return False
+        return True
+
+    def find_terms(self, text):
+        """Términos contenidos en text"""
+        return {self.terms[term_id] for term_id in self.scan(text)}
+
+    def match_fields(self, fields):
+        """Recorre cada campo una vez y devuelve {término: {campos donde aparece}}"""
+        matches = {}
+        for field, text in fields.items():
+            for term_id in self.scan(text):
+                matches.setdefault(self.terms[term_id], set()).add(field)
+        return matches
+
+
+@functools.lru_cache(maxsize=32)
+def get_keyword_matcher(terms, whole_words=False):
+    """Matcher compilado y reutilizable para una tupla de términos"""
+    return KeywordMatcher(terms, whole_words)
+
+
+def get_category_matcher():
+    """Matcher con todos los términos de JOB_CATEGORIES (solo palabras completas)"""
+    return get_keyword_matcher(tuple(term for terms in JOB_CATEGORIES.values() for term in terms), whole_words=True)
+
+
+@functools.lru_cache(maxsize=4)
+def _build_category_term_ids(matcher, categories):
+    return {category: frozenset(matcher.term_ids[term] for term in map(fold_text, terms) if term in matcher.term_ids)
+            for category, terms in categories}
+
+
+def match_categories(job):
+    """Categorías de JOB_CATEGORIES con algún término presente en el empleo (en orden de configuración)"""
+    categories = tuple((category, tuple(terms)) for category, terms in JOB_CATEGORIES.items())
+    category_term_ids = _build_category_term_ids(get_category_matcher(), categories)
+    term_ids = {term_id for term_id, _, _ in get_term_counts(job)}
+    return [category for category, ids in category_term_ids.items() if not ids.isdisjoint(term_ids)]
+
+
+def get_term_counts(job):
+    """Apariciones de términos de JOB_CATEGORIES por campo: ((término, campo, frecuencia), ...)
+
+    Campo 0 = título, 1 = empresa, 2 = descripción. Se calcula una vez y se guarda en '_terms'.
+    """
+    counts = job.get("_terms")
+    if counts is None:
+        folded = get_normalized_text(job)
+        matcher = get_category_matcher()
+        counts = tuple(
+            (term_id, field, frequency)
+            for field, text in enumerate((folded.title, folded.company, folded.description))
+            for term_id, frequency in matcher.count(text).items()
+        )
+        job["_terms"] = counts
+    return counts
+
+# ============================================================================
+# RESOLUCIÓN DE UBICACIONES
+# ============================================================================
+
+LocationMatch = namedtuple("LocationMatch", ["region", "tier", "points"])
+
+
+class LocationMatcher:
+    """Resuelve una ubicación a su región canónica y nivel de prioridad con una sola regex compilada
+
+    Los nombres y alias se comparan normalizados y por palabra completa ('uk' no coincide con 'ukraine').
+    Si aparecen varias regiones ('Remote - USA') gana la de más puntos. Los resultados se memoizan por
+    cadena de ubicación: miles de empleos comparten unas pocas decenas de ubicaciones distintas.
+    """
+
+    MAX_MEMO_ENTRIES = 4096
+
+    def __init__(self, tiers, aliases):
+        self._regions = {}
+        for tier, (points, locations) in tiers.items():
+            for location in locations:
+                self._regions.setdefault(fold_text(location), LocationMatch(location, tier, points))
+        for alias, canonical in aliases.items():
+            match = self._regions.get(fold_text(canonical))
+            if match:
+                self._regions.setdefault(fold_text(alias), match)
+        
+        names = sorted(self._regions, key=len, reverse=True)  # Prioriza 'costa rica' sobre subcadenas
+        self._pattern = re.compile(r"(?<![a-z0-9])(?:" + "|".join(re.escape(name) for name in names) + r")(?![a-z0-9])")
+        self._memo = {}
+
+    def resolve(self, location):
+        """LocationMatch de la ubicación (ya normalizada con fold_text) o None"""
+        try:
+            return self._memo[location]
+        except KeyError:
+            pass
+        
+        best = None
+        for found in self._pattern.finditer(location):
+            match = self._regions[found.group()]
+            if best is None or match.points > best.points:
+                best = match
+        if len(self._memo) >= self.MAX_MEMO_ENTRIES:
+            self._memo.clear()
+        self._memo[location] = best
+        return best
+
+
+@functools.lru_cache(maxsize=4)
+def _build_location_matcher(tiers, aliases):
+    return LocationMatcher({tier: (points, locations) for tier, points, locations in tiers}, dict(aliases))
+
+
+def get_location_matcher():
+    """Matcher de PREFERRED_LOCATION_TIERS y LOCATION_ALIASES (se recompila si cambia la configuración)"""
+    tiers = tuple((tier, points, tuple(locations)) for tier, (points, locations) in PREFERRED_LOCATION_TIERS.items())
+    return _build_location_matcher(tiers, tuple(LOCATION_ALIASES.items()))
+
+
+def resolve_location(location):
+    """Región canónica y nivel de prioridad de una ubicación en texto libre (o None)"""
+    return get_location_matcher().resolve(fold_text(location))
+
+# ============================================================================
+# EXTRACCIÓN DE SALARIOS
+# ============================================================================
+
+class SalaryExtractor:
+    """Extrae rangos salariales del texto ("COP 8.000.000/mes", "$45/hr", "€60k") y los pasa a USD anuales
+
+    Solo se aceptan cantidades con moneda explícita (símbolo o código) y con un periodo explícito o
+    una palabra de remuneración cerca ("salary", "sueldo", "pay"...). Se descartan montos de
+    financiación ("$5M seed", "$20M Series B") y beneficios ("$500 home office stipend").
+    Sin periodo explícito se infiere por magnitud en USD (hasta 300 por hora, hasta 20.000 mensual y
+    por encima anual) y el resultado se marca como estimado.
+    """
+
+    CURRENCY_SYMBOLS = {"us$": "USD", "col$": "COP", "r$": "BRL", "s/": "PEN", "$": "USD", "€": "EUR", "£": "GBP", "₹": "INR"}
+    PERIOD_WORDS = {
+        "hour": ("hour", "hr", "h", "hora"),
+        "day": ("day", "dia", "daily", "diario"),
+        "week": ("week", "wk", "semana", "weekly", "semanal"),
+        "month": ("month", "mo", "mes", "monthly", "mensual", "mensuales"),
+        "year": ("year", "yr", "ano", "annual", "annually", "annum", "anual", "anuales", "pa")
+    }
+    PAY_WORDS = ("salary", "salario", "sueldo", "compensation", "compensacion", "pay", "paid", "pays",
+                 "wage", "wages", "rate", "remuneracion", "ote", "base")
+    NON_SALARY_WORDS = ("seed", "series", "funding", "raised", "round", "valuation", "investment", "investors",
+                        "revenue", "arr", "stipend", "budget", "allowance", "bonus", "reimbursement", "equity",
+                        "grant", "bono", "auxilio", "presupuesto", "financiacion", "inversion")
+    WINDOW_CHARS = 40
+    FOLLOWING_WORDS = 3   # Palabras tras el monto en las que se buscan NON_SALARY_WORDS
+    MIN_ANNUAL_USD = 1000
+    MAX_ANNUAL_USD = 1000000
+
+    def __init__(self, rates=None):
+        self.rates = dict(CURRENCY_RATES_USD if rates is None else rates)
+        codes = "|".join(code.lower() for code in sorted(self.rates, key=len, reverse=True))
+        # Los símbolos con letras ("s/", "r$") deben empezar palabra: "posts/300" no es un sueldo en soles
+        symbols = "|".join(rf"(?<![a-z0-9]){re.escape(symbol)}" if symbol[0].isalpha() else re.escape(symbol)
+                           for symbol in sorted(self.CURRENCY_SYMBOLS, key=len, reverse=True))
+        currency = rf"(?:(?<![a-z])(?:{codes})(?![a-z])|{symbols})"
+        number = r"\d{1,3}(?:[.,]\d{3})+(?:[.,]\d{1,2})?|\d+(?:[.,]\d+)?"
+        self._period_by_word = {word: period for period, words in self.PERIOD_WORDS.items() for word in words}
+        periods = "|".join(sorted(self._period_by_word, key=len, reverse=True))
+        
+        self._pattern = re.compile(
+            rf"(?P<pre>{currency})?\s?(?P<low>{number})\s?(?P<low_k>k(?![a-z]))?"
+            rf"(?:\s?(?:-|–|—|to|a|hasta)\s?(?:{currency})?\s?(?P<high>{number})\s?(?P<high_k>k(?![a-z]))?)?"
+            rf"\s?(?P<post>{currency})?"
+            rf"(?:\s?(?:/|per|por|an?|al|a la)?\s?(?P<period>{periods})(?![a-z]))?"
+        )
+        self._codes = frozenset(code.lower() for code in self.rates)
+        
+        # Escala de financiación tras el monto ("$5M", "$20 million", "$1.2bn") y contexto de pago
+        self._scale_suffix = re.compile(r"\s?(?:m|mm|mn|million|millions|millon|millones|b|bn|billion|billones)(?![a-z])")
+        self._pay_context = re.compile(r"(?<![a-z])(?:" + "|".join(self.PAY_WORDS) + r")(?![a-z])")
+        self._following_stop = re.compile(r"[+;,(]|(?<![a-z])(?:plus|and|y|mas)(?![a-z])")
+
+    @staticmethod
+    def _parse_amount(text, thousands):
+        """'8.000.000' -> 8000000, '45,5' -> 45.5, '60' + k -> 60000"""
+        if "." in text and "," in text:
+            decimal = "." if text.rfind(".") > text.rfind(",") else ","
+            text = text.replace("," if decimal == "." else ".", "").replace(decimal, ".")
+        elif "." in text or "," in text:
+            separator = "." if "." in text else ","
+            groups = text.split(separator)
+            if len(groups) > 2 or len(groups[-1]) == 3:
+                text = "".join(groups)  # Separador de miles
+            else:
+                text = ".".join(groups)
+        value = float(text)
+        return value * 1000 if thousands else value
+
+    def _currency(self, token):
+        token = token.strip().lower()
+        return self.CURRENCY_SYMBOLS.get(token) or token.upper()
+
+    def _currency_positions(self, text, tokens=None):
+        """Posiciones de símbolos y códigos de moneda (búsqueda con str.find, sin regex sobre todo el texto)"""
+        if tokens is None:
+            tokens = _TOKEN_RE.findall(text)
+        needles = [symbol for symbol in self.CURRENCY_SYMBOLS if symbol in text]
+        needles.extend(self._codes.intersection(tokens))
+        
+        positions = []
+        for needle in needles:
+            start = text.find(needle)
+            while start != -1:
+                positions.append(start)
+                start = text.find(needle, start + 1)
+        return sorted(positions)
+
+    def extract(self, text, tokens=None):
+        """(mínimo, máximo, periodo explícito) en USD anuales del primer salario válido en texto normalizado, o None"""
+        if not text:
+            return None
+        
+        # Solo se analizan ventanas alrededor de cada moneda: el resto del texto no puede contener salarios
+        for position in self._currency_positions(text, tokens):
+            window = text[max(0, position - self.WINDOW_CHARS):position + 2 * self.WINDOW_CHARS]
+            salary = self._extract_window(window)
+            if salary:
+                return salary
+        return None
+
+    def _extract_window(self, text):
+        for found in self._pattern.finditer(text):
+            currency_token = found.group("pre") or found.group("post")
+            if not currency_token:
+                continue
+            rate = self.rates.get(self._currency(currency_token))
+            if rate is None:
+                continue
+            
+            low = self._parse_amount(found.group("low"), found.group("low_k"))
+            high = self._parse_amount(found.group("high"), found.group("high_k")) if found.group("high") else 0.0
+            if found.group("high_k") and not found.group("low_k") and low < 1000:
+                low *= 1000  # "$60-80k"
+            if low <= 0 or self._is_non_salary(text, found):
+                continue
+            
+            period = self._period_by_word.get(found.group("period") or "")
+            explicit_period = period is not None
+            if not explicit_period and not self._pay_context.search(text):
+                continue  # Un monto suelto con moneda no es necesariamente un sueldo
+            if period is None:
+                low_usd = low * rate
+                period = "hour" if low_usd <= 300 else "month" if low_usd <= 20000 else "year"
+            factor = rate * SALARY_PERIODS_PER_YEAR[period]
+            
+            annual_low = int(round(low * factor))
+            annual_high = int(round(high * factor)) if high > low else 0
+            if self.MIN_ANNUAL_USD <= annual_low <= self.MAX_ANNUAL_USD:
+                return annual_low, annual_high, explicit_period
+        return None
+
+    def _is_non_salary(self, text, found):
+        """Monto de financiación o beneficio: escala M/B detrás, o 'seed', 'stipend'... en las palabras siguientes"""
+        if self._scale_suffix.match(text, found.end("high") if found.group("high") else found.end("low")):
+            return True
+        following = text[found.end():found.end() + 2 * self.WINDOW_CHARS]
+        stop = self._following_stop.search(following)
+        if stop:
+            following = following[:stop.start()]
+        return any(word in self.NON_SALARY_WORDS for word in _TOKEN_RE.findall(following)[:self.FOLLOWING_WORDS])
+
+    def annotate(self, records):
+        """Etapa por lotes: completa el salario de los empleos sin salario estructurado
+
+        Con periodo explícito se escribe en salary_min/salary_max. Sin periodo (inferido por magnitud)
+        va a '_salary_estimate': cuenta para el score pero nunca excluye un empleo por min_salary.
+        """
+        found = 0
+        for record in records:
+            if record.get("salary_min", 0) > 0:
+                continue
+            folded = get_normalized_text(record)
+            salary = self.extract(folded.title) or self.extract(folded.description, folded.tokens)
+            if salary:
+                low, high, explicit_period = salary
+                if explicit_period:
+                    record["salary_min"], record["salary_max"] = low, high
+                else:
+                    record["_salary_estimate"] = (low, high)
+                found += 1
+        return found
+
+
+@functools.lru_cache(maxsize=4)
+def _build_salary_extractor(rates):
+    return SalaryExtractor(dict(rates))
+
+
+def get_salary_extractor():
+    """Extractor para CURRENCY_RATES_USD (se recompila si cambia la tabla)"""
+    return _build_salary_extractor(tuple(sorted(CURRENCY_RATES_USD.items())))
+
+# ============================================================================
+# DETECCIÓN DE CASI-DUPLICADOS
+# ============================================================================
+
+class NearDuplicateDetector:
+    """Agrupa la misma vacante publicada con títulos o URLs ligeramente distintos (MinHash + LSH)
+
+    Cada empleo se resume en una firma MinHash de los shingles (3 palabras) de su título, empresa y
+    descripción normalizados. Las bandas LSH proponen candidatos sin comparar todos contra todos y
+    solo se fusionan los pares cuya similitud estimada alcanza el umbral y cuyos títulos también se
+    parecen: dos vacantes distintas de una empresa comparten su descripción corporativa, no el título.
+    Los textos cortos tienen muy pocos shingles para que las bandas los emparejen: se comparan
+    además por empresa y descripción normalizadas idénticas, con un título contenido en el otro
+    ("BIM Coordinator" y "BIM Coordinator (Remote)").
+    """
+
+    MASK_64 = (1 << 64) - 1
+    SHINGLE_MIX = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F)
+    SHINGLE_WORDS = 3
+    MAX_BUCKET_COMPARISONS = 16   # Acota el coste con textos repetitivos (plantillas de una misma empresa)
+    SHORT_DOCUMENT_TOKENS = 30    # Por debajo, comparación exacta de empresa y descripción
+
+    def __init__(self, threshold=None, num_perm=None, seed=1):
+        self.threshold = ENGINE_SETTINGS.get("near_duplicate_threshold", 0.8) if threshold is None else threshold
+        self.title_threshold = ENGINE_SETTINGS.get("near_duplicate_title_threshold", 0.5)
+        self.num_perm = num_perm or ENGINE_SETTINGS.get("minhash_permutations", 64)
+        # Hashing multiply-shift: ((a·x + b) mod 2^64) >> 32, con a impar
+        rng = random.Random(seed)
+        self._a = [rng.getrandbits(64) | 1 for _ in range(self.num_perm)]
+        self._b = [rng.getrandbits(64) for _ in range(self.num_perm)]
+        self.bands, self.rows = self._lsh_shape(self.threshold, self.num_perm)
+
+    @staticmethod
+    def _lsh_shape(threshold, num_perm):
+        """(bandas, filas) cuyo umbral aproximado (1/b)^(1/r) queda más cerca por debajo del pedido"""
+        shapes = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+        below = [shape for shape in shapes if (1 / shape[0]) ** (1 / shape[1]) <= threshold]
+        return max(below or shapes[:1], key=lambda shape: (1 / shape[0]) ** (1 / shape[1]))
+
+    def _token_hashes(self, record):
+        """crc32 de los tokens normalizados (título, empresa, descripción); al menos SHINGLE_WORDS valores"""
+        folded = get_normalized_text(record)
+        max_tokens = ENGINE_SETTINGS.get("minhash_max_tokens", 300)
+        tokens = _TOKEN_RE.findall(f"{folded.title} {folded.company} {folded.description[:max_tokens * 16]}")[:max_tokens]
+        hashes = [zlib.crc32(token.encode("utf-8")) for token in tokens]
+        return hashes + [0] * (self.SHINGLE_WORDS - len(hashes))
+
+    def _shingles(self, record):
+        """Hash (64 bits) de cada shingle de 3 tokens consecutivos"""
+        hashes = self._token_hashes(record)
+        return {(first * self.SHINGLE_MIX[0] ^ second * self.SHINGLE_MIX[1] ^ third) & self.MASK_64
+                for first, second, third in zip(hashes, hashes[1:], hashes[2:])}
+
+    def signatures(self, records):
+        """Firmas MinHash (bytes, uint32) de los registros; se calculan por lotes y se guardan en '_minhash'"""
+        signature_bytes = self.num_perm * 4
+        pending = [record for record in records if len(record.get("_minhash", b"")) != signature_bytes]
+        if pending:
+            if NUMPY_AVAILABLE:
+                self._signatures_numpy(pending)
+            else:
+                for record in pending:
+                    shingles = self._shingles(record)
+                    signature = array("I", (min(((a * x + b) & self.MASK_64) >> 32 for x in shingles)
+                                            for a, b in zip(self._a, self._b)))
+                    record["_minhash"] = signature.tobytes()
+        return [record["_minhash"] for record in records]
+
+    def _signatures_numpy(self, records, max_shingles=50000):
+        a = np.asarray(self._a, dtype=np.uint64)[:, None]
+        b = np.asarray(self._b, dtype=np.uint64)[:, None]
+        mix_first, mix_second = (np.uint64(value) for value in self.SHINGLE_MIX)
+        start = 0
+        while start < len(records):
+            # Lotes acotados: la matriz intermedia es permutaciones x shingles del lote
+            batch, hashes, lengths = [], [], []
+            while start < len(records) and (not batch or len(hashes) < max_shingles):
+                token_hashes = self._token_hashes(records[start])
+                batch.append(records[start])
+                hashes.extend(token_hashes)
+                lengths.append(len(token_hashes))
+                start += 1
+            
+            # Shingles de todo el lote a la vez, sin cruzar el límite entre registros
+            tokens = np.asarray(hashes, dtype=np.uint64)
+            lengths = np.asarray(lengths, dtype=np.int64)
+            counts = lengths - (self.SHINGLE_WORDS - 1)
+            offsets = np.cumsum(counts) - counts
+            positions = np.arange(counts.sum()) - np.repeat(offsets, counts) + np.repeat(np.cumsum(lengths) - lengths, counts)
+            shingles = (tokens[positions] * mix_first) ^ (tokens[positions + 1] * mix_second) ^ tokens[positions + 2]
+            
+            permuted = (a * shingles[None, :] + b) >> np.uint64(32)
+            minimums = np.minimum.reduceat(permuted, offsets, axis=1).astype(np.uint32)
+            for column, record in enumerate(batch):
+                record["_minhash"] = minimums[:, column].tobytes()
+
+    def similarity(self, first, second):
+        """Jaccard estimada: fracción de posiciones iguales entre dos firmas"""
+        if NUMPY_AVAILABLE:
+            return np.count_nonzero(np.frombuffer(first, dtype=np.uint32) == np.frombuffer(second, dtype=np.uint32)) / self.num_perm
+        return sum(x == y for x, y in zip(array("I", first), array("I", second))) / self.num_perm
+
+    @staticmethod
+    def _title_tokens(record):
+        return set(_TOKEN_RE.findall(get_normalized_text(record).title))
+
+    def title_similarity(self, first, second):
+        """Jaccard entre los tokens de los títulos normalizados"""
+        first_tokens = self._title_tokens(first)
+        second_tokens = self._title_tokens(second)
+        if not first_tokens and not second_tokens:
+            return 1.0
+        return len(first_tokens & second_tokens) / len(first_tokens | second_tokens)
+
+    def _short_key(self, record):
+        """(empresa, descripción) normalizadas si el texto es corto y tiene descripción; si no, None"""
+        folded = get_normalized_text(record)
+        if not folded.description:
+            return None
+        tokens = _TOKEN_RE.findall(f"{folded.title} {folded.company} {folded.description[:self.SHORT_DOCUMENT_TOKENS * 32]}")
+        if len(tokens) >= self.SHORT_DOCUMENT_TOKENS:
+            return None
+        return folded.company, folded.description
+
+    def is_duplicate(self, first, second, first_signature, second_signature):
+        """Misma vacante: firmas MinHash por encima del umbral y títulos parecidos
+
+        En textos cortos basta con empresa y descripción idénticas y un título contenido en el otro.
+        """
+        short_key = self._short_key(first)
+        if short_key is not None and short_key == self._short_key(second):
+            first_tokens, second_tokens = self._title_tokens(first), self._title_tokens(second)
+            if first_tokens <= second_tokens or second_tokens <= first_tokens:
+                return True
+        return (self.similarity(first_signature, second_signature) >= self.threshold
+                and self.title_similarity(first, second) >= self.title_threshold)
+
+    def clusters(self, records):
+        """Grupos de posiciones de records que son la misma vacante (cada grupo en orden de aparición)"""
+        signatures = self.signatures(records)
+        parent = list(range(len(records)))
+        
+        def find(position):
+            while parent[position] != position:
+                parent[position] = parent[parent[position]]
+                position = parent[position]
+            return position
+        
+        def merge(buckets, key, position):
+            members = buckets.setdefault(key, [])
+            for other in members[:self.MAX_BUCKET_COMPARISONS]:
+                root, other_root = find(position), find(other)
+                if root != other_root and self.is_duplicate(records[position], records[other],
+                                                             signatures[position], signatures[other]):
+                    parent[max(root, other_root)] = min(root, other_root)
+            members.append(position)
+        
+        band_bytes = self.rows * 4
+        for band in range(self.bands):
+            buckets = {}
+            for position, signature in enumerate(signatures):
+                merge(buckets, signature[band * band_bytes:(band + 1) * band_bytes], position)
+        
+        # Textos cortos: candidatos por empresa y descripción idénticas
+        buckets = {}
+        for position, record in enumerate(records):
+            short_key = self._short_key(record)
+            if short_key is not None:
+                merge(buckets, short_key, position)
+        
+        groups = {}
+        for position in range(len(records)):
+            groups.setdefault(find(position), []).append(position)
+        return list(groups.values())
+
+    @staticmethod
+    def canonical(records):
+        """Registro que representa al grupo: con salario, luego descripción más completa, luego el primero"""
+        return max(records, key=lambda record: (record.get("salary_min", 0) > 0,
+                                                len(get_normalized_text(record).description)))
+
+
+@functools.lru_cache(maxsize=4)
+def get_near_duplicate_detector(threshold=None):
+    """Detector compartido por umbral (las firmas no dependen del umbral y se reutilizan)"""
+    return NearDuplicateDetector(threshold)
+
+
+# ============================================================================
+# RANKING BM25
+# ============================================================================
+
+class BM25Scorer:
+    """BM25F por campos (título, empresa, descripción) sobre una matriz término-documento dispersa
+
+    La matriz se arma en formato COO a partir de las frecuencias cacheadas en cada empleo
+    (get_term_counts) y se puntúa en una sola pasada vectorizada con NumPy si está disponible.
+    """
+
+    FIELD_WEIGHTS = (3.0, 2.0, 1.0)
+
+    def __init__(self, terms, k1=None, b=None):
+        query_counts = Counter(fold_text(term) for term in terms if term)
+        self.terms = list(query_counts)
+        self.query_weights = [query_counts[term] for term in self.terms]  # Términos repetidos pesan más
+        self.k1 = ENGINE_SETTINGS.get("bm25_k1", 1.2) if k1 is None else k1
+        self.b = ENGINE_SETTINGS.get("bm25_b", 0.75) if b is None else b
+        
+        category_ids = get_category_matcher().term_ids
+        self._columns = {category_ids[term]: column for column, term in enumerate(self.terms) if term in category_ids}
+        self._extra_terms = [(column, term) for column, term in enumerate(self.terms) if term not in category_ids]
+        self._statistics = None  # (documentos, frecuencia documental, longitudes medias) fijados con fit
+
+    def _entries(self, records):
+        """Entradas COO (documento, término, campo, frecuencia) y longitudes de campo por documento"""
+        docs, columns, fields, frequencies, lengths = [], [], [], [], []
+        for doc, record in enumerate(records):
+            folded = get_normalized_text(record)
+            lengths.append(folded.lengths)
+            for term_id, field, frequency in get_term_counts(record):
+                column = self._columns.get(term_id)
+                if column is not None:
+                    docs.append(doc)
+                    columns.append(column)
+                    fields.append(field)
+                    frequencies.append(frequency)
+            
+            # Términos fuera de JOB_CATEGORIES (p. ej. el filtro adicional): conteo directo
+            for column, term in self._extra_terms:
+                for field, text in enumerate((folded.title, folded.company, folded.description)):
+                    frequency = text.count(term)
+                    if frequency:
+                        docs.append(doc)
+                        columns.append(column)
+                        fields.append(field)
+                        frequencies.append(frequency)
+        return docs, columns, fields, frequencies, lengths
+
+    def fit(self, records):
+        """Fija las estadísticas del corpus (IDF y longitudes medias) a partir de records
+
+        Con estadísticas fijas, puntuar por lotes da lo mismo que puntuar todo el conjunto de una vez.
+        """
+        docs, columns, _, _, lengths = self._entries(records)
+        document_frequency = [0] * len(self.terms)
+        for _, column in set(zip(docs, columns)):
+            document_frequency[column] += 1
+        n_docs = len(records)
+        average_lengths = [(sum(length[field] for length in lengths) / n_docs if n_docs else 0.0) or 1.0
+                           for field in range(len(self.FIELD_WEIGHTS))]
+        self._statistics = (n_docs, document_frequency, average_lengths)
+        return self
+
+    def score(self, records):
+        """Puntuación BM25 de cada registro (misma posición que en records)"""
+        if not records or not self.terms:
+            return [0.0] * len(records)
+        
+        entries = self._entries(records)
+        if NUMPY_AVAILABLE:
+            return self._score_numpy(len(records), *entries)
+        return self._score_python(len(records), *entries)
+
+    def _score_numpy(self, n_docs, docs, columns, fields, frequencies, lengths):
+        if not docs:
+            return [0.0] * n_docs
+        n_terms = len(self.terms)
+        docs = np.asarray(docs, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        fields = np.asarray(fields, dtype=np.int64)
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        
+        field_lengths = np.asarray(lengths, dtype=np.float64)
+        if self._statistics is not None:
+            corpus_docs, corpus_frequency, average_lengths = self._statistics
+            average_lengths = np.asarray(average_lengths, dtype=np.float64)
+        else:
+            average_lengths = field_lengths.mean(axis=0)
+            average_lengths[average_lengths == 0] = 1.0
+        length_norm = 1.0 - self.b + self.b * field_lengths / average_lengths
+        
+        # Frecuencia ponderada por campo y normalizada por longitud, agregada por (documento, término)
+        weighted = np.asarray(self.FIELD_WEIGHTS)[fields] * frequencies / length_norm[docs, fields]
+        keys, inverse = np.unique(docs * n_terms + columns, return_inverse=True)
+        term_frequency = np.bincount(inverse.ravel(), weights=weighted)
+        key_docs = keys // n_terms
+        key_columns = keys % n_terms
+        
+        if self._statistics is not None:
+            document_frequency = np.asarray(corpus_frequency, dtype=np.float64)
+        else:
+            corpus_docs = n_docs
+            document_frequency = np.bincount(key_columns, minlength=n_terms)
+        idf = np.log1p((corpus_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+        query_weights = np.asarray(self.query_weights, dtype=np.float64)
+        
+        contributions = (idf[key_columns] * query_weights[key_columns] * term_frequency * (self.k1 + 1)
+                         / (term_frequency + self.k1))
+        return np.bincount(key_docs, weights=contributions, minlength=n_docs).tolist()
+
+    def _score_python(self, n_docs, docs, columns, fields, frequencies, lengths):
+        field_count = len(self.FIELD_WEIGHTS)
+        if self._statistics is not None:
+            corpus_docs, corpus_frequency, average_lengths = self._statistics
+        else:
+            corpus_docs, corpus_frequency = n_docs, None
+            average_lengths = [(sum(length[f] for length in lengths) / n_docs) or 1.0 for f in range(field_count)]
+        
+        term_frequency = {}
+        for doc, column, field, frequency in zip(docs, columns, fields, frequencies):
+            norm = 1.0 - self.b + self.b * lengths[doc][field] / average_lengths[field]
+            key = (doc, column)
+            term_frequency[key] = term_frequency.get(key, 0.0) + self.FIELD_WEIGHTS[field] * frequency / norm
+        
+        document_frequency = corpus_frequency or Counter(column for _, column in term_frequency)
+        scores = [0.0] * n_docs
+        for (doc, column), tf in term_frequency.items():
+            df = document_frequency[column]
+            idf = math.log1p((corpus_docs - df + 0.5) / (df + 0.5))
+            scores[doc] += idf * self.query_weights[column] * tf * (self.k1 + 1) / (tf + self.k1)
+        return scores
+
+
+class TopKRanker:
+    """Mantiene los K empleos de mayor 'score' en un montículo acotado mientras llegan
+
+    Los desplazados se guardan sin ordenar y solo se ordenan si se pide una página más allá de K.
+    A igual score conserva el orden de llegada, igual que sorted(..., reverse=True).
+    """
+
+    def __init__(self, k=None, keep_overflow=True):
+        self.k = max(1, k or ENGINE_SETTINGS.get("top_k", 20))
+        self.keep_overflow = keep_overflow
+        self._heap = []        # (score, -orden, empleo); la raíz es el peor del top-K
+        self._overflow = []
+        self._overflow_sorted = True
+        self._arrivals = 0
+
+    def __len__(self):
+        return len(self._heap) + len(self._overflow)
+
+    def push(self, job):
+        """Inserta un empleo ya puntuado"""
+        score = job.get("score", 0)
+        arrival = self._arrivals
+        self._arrivals += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, (score, -arrival, job))
+            return
+        
+        # Un empate con la raíz pierde siempre: llegó después
+        if score > self._heap[0][0]:
+            entry = heapq.heapreplace(self._heap, (score, -arrival, job))
+        elif self.keep_overflow:
+            entry = (score, -arrival, job)
+        else:
+            return
+        if self.keep_overflow:
+            self._overflow.append(entry)
+            self._overflow_sorted = False
+
+    def extend(self, jobs):
+        for job in jobs:
+            self.push(job)
+        return self
+
+    def top(self, n=None):
+        """Los mejores n empleos (como máximo K), ordenados"""
+        ranked = [job for _, _, job in sorted(self._heap, reverse=True)]
+        return ranked if n is None else ranked[:n]
+
+    def ranked(self, limit=None):
+        """Ranking hasta limit empleos (todos si es None); ordena los desplazados solo si hace falta"""
+        ranked = self.top()
+        if limit is not None and limit <= len(ranked):
+            return ranked[:limit]
+        if not self._overflow_sorted:
+            self._overflow.sort(reverse=True)
+            self._overflow_sorted = True
+        deeper = self._overflow if limit is None else self._overflow[:limit - len(ranked)]
+        return ranked + [job for _, _, job in deeper]
+
+    def page(self, number, size=None):
+        """Página number (desde 0) del ranking"""
+        size = size or self.k
+        start = number * size
+        return self.ranked(start + size)[start:]
+
+    def jobs(self):
+        """Todos los empleos recibidos, sin orden"""
+        return [job for _, _, job in self._heap] + [job for _, _, job in self._overflow]
+
+# ============================================================================
+# PARSEO JSON EN STREAMING
+# ============================================================================
+
+def iter_json_array(chunks, skip=0):
+    """Decodifica un array JSON elemento a elemento a partir de bloques de bytes
+
+    Nunca construye la lista completa: solo retiene el texto del elemento en curso.
+    Los primeros `skip` elementos se decodifican y descartan (p. ej. la metadata de RemoteOK).
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    whitespace = " \t\r\n"
+    buffer = ""
+    position = 0
+    opened = False
+    closed = False
+    index = 0
+    
+    for chunk in chunks:
+        buffer = buffer[position:] + utf8.decode(chunk)
+        position = 0
+        
+        while not closed:
+            while position < len(buffer) and buffer[position] in whitespace:
+                position += 1
+            if position >= len(buffer):
+                break
+            
+            char = buffer[position]
+            if not opened:
+                if char != "[":
+                    raise ValueError("Se esperaba un array JSON")
+                opened = True
+                position += 1
+                continue
+            if char == ",":
+                position += 1
+                continue
+            if char == "]":
+                closed = True
+                break
+            
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break  # Elemento incompleto: esperar el siguiente bloque
+            position = end
+            index += 1
+            if index > skip:
+                yield item
+    
+    if not closed:
+        raise ValueError("Array JSON incompleto")
+
+# ============================================================================
+# ALMACÉN SQLITE
+# ============================================================================
+
+class JobStore:
+    """Empleos normalizados, índice FTS5 e historial de ejecuciones en una base SQLite local
+
+    Cada ejecución guarda el score de sus empleos en run_jobs, así que el ranking de cualquier
+    búsqueda anterior se lee con SQL (ORDER BY score) sin volver a descargar nada.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            fingerprint TEXT PRIMARY KEY,
+            source TEXT NOT NULL,
+            title TEXT, company TEXT, location TEXT, url TEXT,
+            description TEXT,
+            body TEXT,
+            salary_min INTEGER DEFAULT 0,
+            salary_max INTEGER DEFAULT 0,
+            posted_at REAL,
+            first_seen REAL,
+            last_seen REAL,
+            score INTEGER DEFAULT 0,
+            categories TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs(source);
+        CREATE INDEX IF NOT EXISTS idx_jobs_posted ON jobs(posted_at);
+        CREATE INDEX IF NOT EXISTS idx_jobs_salary ON jobs(salary_min);
+        CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs(location);
+        
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, company, body, content='jobs', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, title, company, body) VALUES (new.rowid, new.title, new.company, new.body);
+        END;
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, company, body) VALUES ('delete', old.rowid, old.title, old.company, old.body);
+        END;
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company, body ON jobs
+        WHEN old.title IS NOT new.title OR old.company IS NOT new.company OR old.body IS NOT new.body BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, company, body) VALUES ('delete', old.rowid, old.title, old.company, old.body);
+            INSERT INTO jobs_fts(rowid, title, company, body) VALUES (new.rowid, new.title, new.company, new.body);
+        END;
+        
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mode TEXT,
+            started_at REAL,
+            finished_at REAL,
+            queries INTEGER DEFAULT 0,
+            jobs INTEGER DEFAULT 0,
+            new_jobs INTEGER DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS run_jobs (
+            run_id INTEGER NOT NULL REFERENCES runs(id),
+            fingerprint TEXT NOT NULL REFERENCES jobs(fingerprint),
+            score INTEGER DEFAULT 0,
+            PRIMARY KEY (run_id, fingerprint)
+        );
+        CREATE INDEX IF NOT EXISTS idx_run_jobs_score ON run_jobs(run_id, score DESC);
+    """
+
+    UPSERT = """
+        INSERT INTO jobs (fingerprint, source, title, company, location, url, description, body,
+                          salary_min, salary_max, posted_at, first_seen, last_seen, score, categories)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(fingerprint) DO UPDATE SET
+            title = excluded.title, company = excluded.company, location = excluded.location,
+            url = excluded.url, description = excluded.description, body = excluded.body,
+            salary_min = excluded.salary_min, salary_max = excluded.salary_max,
+            posted_at = COALESCE(excluded.posted_at, jobs.posted_at),
+            last_seen = excluded.last_seen, score = excluded.score, categories = excluded.categories
+    """
+
+    COLUMNS = "j.fingerprint, j.source, j.title, j.company, j.location, j.url, j.description, j.salary_min, j.salary_max, j.posted_at, j.categories"
+
+    def __init__(self, path, batch_size=500, max_body_chars=5000):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_body_chars = max_body_chars
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._connection is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # La GUI escribe desde el hilo de búsqueda y lee desde el hilo principal
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(self.SCHEMA)
+        return self._connection
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _row(self, job, now):
+        categories = job.get("categories")
+        return (
+            job_fingerprint(job), job.get("source", ""), job.get("title", ""), job.get("company", ""),
+            job.get("location", ""), job.get("url", ""), job.get("description", ""),
+            get_normalized_text(job).description[:self.max_body_chars],
+            int(job.get("salary_min", 0) or 0), int(job.get("salary_max", 0) or 0),
+            job.get("_posted_at"), now, now, int(job.get("score", 0) or 0),
+            json.dumps(categories, ensure_ascii=False) if categories else None
+        )
+
+    def upsert_jobs(self, jobs, run_id=None):
+        """Inserta o actualiza empleos reales por lotes (una transacción por lote); devuelve cuántos eran nuevos"""
+        now = time.time()
+        new_jobs = 0
+        jobs = [job for job in jobs if not is_search_link(job)]
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(jobs), self.batch_size):
+                rows = [self._row(job, now) for job in jobs[start:start + self.batch_size]]
+                fingerprints = [row[0] for row in rows]
+                with connection:
+                    placeholders = ",".join("?" * len(fingerprints))
+                    known = {fingerprint for (fingerprint,) in connection.execute(
+                        f"SELECT fingerprint FROM jobs WHERE fingerprint IN ({placeholders})", fingerprints)}
+                    new_jobs += len(set(fingerprints) - known)
+                    connection.executemany(self.UPSERT, rows)
+                    if run_id is not None:
+                        connection.executemany(
+                            "INSERT OR REPLACE INTO run_jobs (run_id, fingerprint, score) VALUES (?, ?, ?)",
+                            [(run_id, row[0], row[13]) for row in rows])
+        return new_jobs
+
+    def record_run(self, mode, jobs, queries=0, started_at=None):
+        """Guarda los empleos y una entrada de historial con su ranking; devuelve el id de la ejecución"""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                run_id = connection.execute("INSERT INTO runs (mode, started_at, queries) VALUES (?, ?, ?)",
+                                            (mode, started_at or time.time(), queries)).lastrowid
+        new_jobs = self.upsert_jobs(jobs, run_id)
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE runs SET finished_at = ?, jobs = (SELECT COUNT(*) FROM run_jobs WHERE run_id = ?), new_jobs = ? WHERE id = ?",
+                    (time.time(), run_id, new_jobs, run_id))
+        return run_id
+
+    def _job(self, row, score):
+        fingerprint, source, title, company, location, url, description, salary_min, salary_max, posted_at, categories = row
+        job = JobRecord(title=title, company=company, location=location,
+                        salary_min=salary_min or 0, salary_max=salary_max or 0,
+                        url=url, description=description, source=source, score=score or 0,
+                        _posted_at=posted_at)
+        if categories:
+            job.categories = json.loads(categories)
+        return job
+
+    def runs(self, limit=20):
+        """Historial de ejecuciones, la más reciente primero"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id, mode, started_at, finished_at, queries, jobs, new_jobs FROM runs ORDER BY id DESC LIMIT ?",
+                (limit,)).fetchall()
+        keys = ("id", "mode", "started_at", "finished_at", "queries", "jobs", "new_jobs")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def ranked(self, run_id=None, limit=100, offset=0, source=None, min_salary=None):
+        """Ranking guardado de una ejecución (la última si run_id es None)"""
+        with self._lock:
+            connection = self._connect()
+            if run_id is None:
+                latest = connection.execute("SELECT MAX(id) FROM runs").fetchone()
+                run_id = latest[0] if latest else None
+                if run_id is None:
+                    return []
+            sql = f"SELECT {self.COLUMNS}, r.score FROM run_jobs r JOIN jobs j ON j.fingerprint = r.fingerprint WHERE r.run_id = ?"
+            params = [run_id]
+            if source:
+                sql += " AND j.source = ?"
+                params.append(source)
+            if min_salary:
+                sql += " AND j.salary_min >= ?"
+                params.append(min_salary)
+            sql += " ORDER BY r.score DESC, j.rowid LIMIT ? OFFSET ?"
+            rows = connection.execute(sql, params + [limit, offset]).fetchall()
+        return [self._job(row[:-1], row[-1]) for row in rows]
+
+    def search(self, query, limit=100, since_days=None, source=None, min_salary=None):
+        """Búsqueda de texto completo en todo lo guardado: todas las palabras (como prefijo) en título, empresa o descripción
+
+        Ordena por relevancia BM25 frente a la consulta (el score guardado solo desempata).
+        since_days filtra por fecha de publicación (o por la primera vez que se vio si la fuente no la da).
+        """
+        match = " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(fold_text(query)))
+        if not match:
+            return []
+        sql = (f"SELECT {self.COLUMNS}, j.score FROM jobs_fts f JOIN jobs j ON j.rowid = f.rowid "
+               "WHERE jobs_fts MATCH ?")
+        params = [match]
+        if since_days:
+            sql += " AND COALESCE(j.posted_at, j.first_seen) >= ?"
+            params.append(time.time() - since_days * 86400)
+        if source:
+            sql += " AND j.source = ?"
+            params.append(source)
+        if min_salary:
+            sql += " AND j.salary_min >= ?"
+            params.append(min_salary)
+        sql += " ORDER BY bm25(jobs_fts, 3.0, 2.0, 1.0), j.score DESC LIMIT ?"
+        with self._lock:
+            rows = self._connect().execute(sql, params + [limit]).fetchall()
+        return [self._job(row[:-1], row[-1]) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+# ============================================================================
+# ÍNDICE INVERTIDO LOCAL
+# ============================================================================
+
+_QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+class InvertedIndex:
+    """Índice invertido token -> {id de empleo: campos donde aparece} sobre los empleos ya descargados
+
+    Los campos se guardan como máscara de bits (título, empresa, ubicación, descripción); las frases
+    se confirman contra el texto normalizado del campo, que ya está en memoria.
+    Consultas: palabras (AND), "frases exactas" y prefijos (palabra*).
+    """
+
+    FIELDS = ("title", "company", "location", "description")
+    FIELD_WEIGHTS = (3, 2, 1, 1)
+
+    def __init__(self):
+        self.docs = []                  # id -> registro normalizado (None si se retiró)
+        self.fingerprints = []          # id -> huella estable (None si se retiró)
+        self.postings = {}              # token -> {id: máscara de campos}
+        self._ids_by_fingerprint = {}
+        self._vocabulary = []           # Tokens ordenados para búsquedas por prefijo
+        self._vocabulary_dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._ids_by_fingerprint)
+
+    def _field_tokens(self, record):
+        folded = get_normalized_text(record)
+        for field_bit, field in enumerate(self.FIELDS):
+            for token in set(_TOKEN_RE.findall(getattr(folded, field))):
+                yield field_bit, token
+
+    def add(self, record):
+        """Indexa un empleo normalizado; si su huella ya estaba, la versión nueva sustituye a la anterior"""
+        fingerprint = job_fingerprint(record)
+        with self._lock:
+            doc_id = self._ids_by_fingerprint.get(fingerprint)
+            if doc_id is None:
+                doc_id = len(self.docs)
+                self.docs.append(None)
+                self.fingerprints.append(fingerprint)
+                self._ids_by_fingerprint[fingerprint] = doc_id
+            else:
+                self._unindex(doc_id)
+            self.docs[doc_id] = record
+            
+            for field_bit, token in self._field_tokens(record):
+                entry = self.postings.get(token)
+                if entry is None:
+                    entry = self.postings[token] = {}
+                    self._vocabulary_dirty = True
+                entry[doc_id] = entry.get(doc_id, 0) | (1 << field_bit)
+            return doc_id
+
+    def add_many(self, records):
+        for record in records:
+            self.add(record)
+
+    def _unindex(self, doc_id):
+        """Quita el registro actual de doc_id de las listas de postings"""
+        for _, token in self._field_tokens(self.docs[doc_id]):
+            entry = self.postings.get(token)
+            if entry is not None:
+                entry.pop(doc_id, None)
+                if not entry:
+                    del self.postings[token]
+                    self._vocabulary_dirty = True
+
+    def remove(self, fingerprint):
+        """Retira del índice el empleo con esa huella (si estaba)"""
+        with self._lock:
+            doc_id = self._ids_by_fingerprint.pop(fingerprint, None)
+            if doc_id is not None:
+                self._unindex(doc_id)
+                self.docs[doc_id] = None
+                self.fingerprints[doc_id] = None
+
+    def replace_source(self, source, records):
+        """Sustituye los empleos de una fuente por los de su última descarga (retira los que ya no están)"""
+        with self._lock:
+            current = {job_fingerprint(record) for record in records}
+            for record, fingerprint in zip(self.docs, self.fingerprints):
+                if record is not None and record.get("source") == source and fingerprint not in current:
+                    self.remove(fingerprint)
+            self.add_many(records)
+
+    def _token_postings(self, token, prefix=False):
+        """{id: máscara} para un token exacto o para todos los tokens con ese prefijo"""
+        if not prefix:
+            return self.postings.get(token, {})
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        merged = {}
+        for i in range(bisect_left(self._vocabulary, token), len(self._vocabulary)):
+            candidate = self._vocabulary[i]
+            if not candidate.startswith(token):
+                break
+            for doc_id, mask in self.postings[candidate].items():
+                merged[doc_id] = merged.get(doc_id, 0) | mask
+        return merged
+
+    def _match_clause(self, tokens, phrase=None, prefix_last=False):
+        """{id: máscara} de los empleos que contienen todos los tokens (y la frase, si se indica)"""
+        result = None
+        for i, token in enumerate(tokens):
+            postings = self._token_postings(token, prefix=prefix_last and i == len(tokens) - 1)
+            if result is None:
+                result = dict(postings)
+            else:
+                # Campos que contienen todos los tokens; si están repartidos, todos los implicados
+                result = {doc_id: (mask & postings[doc_id]) or (mask | postings[doc_id])
+                          for doc_id, mask in result.items() if doc_id in postings}
+            if not result:
+                return {}
+        
+        if phrase and len(tokens) > 1 and not prefix_last:
+            confirmed = {}
+            for doc_id, mask in result.items():
+                folded = get_normalized_text(self.docs[doc_id])
+                phrase_mask = sum(1 << bit for bit, field in enumerate(self.FIELDS) if phrase in getattr(folded, field))
+                if phrase_mask:
+                    confirmed[doc_id] = phrase_mask
+            result = confirmed
+        return result or {}
+
+    def search_ids(self, query, as_you_type=False):
+        """Ids que cumplen la consulta, ordenados por peso de los campos coincidentes"""
+        clauses = _QUERY_RE.findall(query)
+        if not clauses:
+            return []
+        
+        with self._lock:
+            scores = None
+            for i, (quoted, word) in enumerate(clauses):
+                is_last = i == len(clauses) - 1 and not query.endswith((" ", '"'))
+                text = fold_text(quoted or word)
+                prefix = bool(word) and (text.endswith("*") or (as_you_type and is_last))
+                tokens = _TOKEN_RE.findall(text.rstrip("*"))
+                if not tokens:
+                    continue
+                
+                matches = self._match_clause(tokens, phrase=" ".join(tokens), prefix_last=prefix)
+                clause_scores = {doc_id: sum(weight for bit, weight in enumerate(self.FIELD_WEIGHTS) if mask & (1 << bit))
+                                 for doc_id, mask in matches.items()}
+                if scores is None:
+                    scores = clause_scores
+                else:
+                    scores = {doc_id: score + clause_scores[doc_id] for doc_id, score in scores.items() if doc_id in clause_scores}
+                if not scores:
+                    return []
+        
+        return sorted(scores or {}, key=lambda doc_id: (-scores[doc_id], doc_id))
+
+    def search(self, query, as_you_type=False):
+        """Registros que cumplen la consulta"""
+        return [self.docs[doc_id] for doc_id in self.search_ids(query, as_you_type)]
+
+    def search_fingerprints(self, query, as_you_type=False):
+        """Huellas de los registros que cumplen la consulta (para filtrar listas ya mostradas)"""
+        return {self.fingerprints[doc_id] for doc_id in self.search_ids(query, as_you_type)}
+
+# ============================================================================
+# ADAPTADORES DE FUENTES
+# ============================================================================
+
+# Registro de adaptadores por nombre de ENABLED_APIS
+SOURCE_ADAPTERS = {}
+
+def register_source(adapter_class):
+    """Registra un adaptador de fuente bajo su clave de ENABLED_APIS"""
+    SOURCE_ADAPTERS[adapter_class.name] = adapter_class
+    return adapter_class
+
+
+class SourceAdapter:
+    """Interfaz común de las fuentes de empleos con feed completo"""
+    name = ""                       # Clave en ENABLED_APIS / SOURCE_LIMITS
+    display_name = ""               # Valor de job["source"]
+    cost = 1                        # Peticiones aproximadas por descarga (el planificador lanza primero las baratas)
+    timeout = 30                    # Presupuesto de segundos por búsqueda de palabra clave (snapshot ya cargado)
+    fetch_timeout = 120             # Presupuesto de segundos para descargar el snapshot (warm_snapshots)
+    supported_filters = ()          # Filtros de SEARCH_FILTERS que la fuente ya garantiza en origen
+    max_results_per_keyword = 10
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def fetch(self):
+        """Empleos crudos del feed completo (iterable: puede ser un generador que descarga a medida que se consume)"""
+        raise NotImplementedError
+
+    def normalize(self, job):
+        """Convierte un empleo crudo al formato común del motor (JobRecord)"""
+        raise NotImplementedError
+
+    def full_description(self, job):
+        """Descripción completa del empleo crudo (la normalizada solo guarda 200 caracteres)"""
+        return ""
+
+    def ingest(self, job):
+        """Normaliza un empleo crudo y precalcula sus campos de búsqueda"""
+        record = as_job_record(self.normalize(job))
+        record._text = build_normalized_text(record.title, record.company, record.location, self.full_description(job))
+        record._posted_at = self.posted_mark(job)
+        return record
+
+    def posted_mark(self, job):
+        """Marca temporal (epoch) de publicación del empleo crudo, o None si la fuente no la ofrece"""
+        return None
+
+    def matches(self, record, keyword):
+        """Indica si un empleo normalizado es relevante para la palabra clave"""
+        return self.engine.is_relevant_job(record, keyword)
+
+    def search(self, keyword):
+        """Busca la palabra clave sobre el snapshot (ya normalizado) de la fuente"""
+        try:
+            records, term_index = self.engine.snapshots[self.name].get_indexed()
+            
+            # Términos de JOB_CATEGORIES: lista de coincidencias precalculada al cargar el snapshot
+            term_id = get_category_matcher().term_ids.get(fold_text(keyword))
+            if term_index is not None and term_id is not None:
+                positions = term_index.get(term_id, [])[:self.max_results_per_keyword]
+                return [records[position].copy() for position in positions]
+            
+            relevant_jobs = []
+            for record in records:
+                if self.matches(record, keyword):
+                    relevant_jobs.append(record.copy())  # Copia: cada búsqueda puntúa su propio resultado
+                    if len(relevant_jobs) >= self.max_results_per_keyword:
+                        break
+                    
+            return relevant_jobs
+                
+        except Exception as e:
+            print(f"⚠️ Error con {self.display_name}: {e}")
+            return []
+
+
+@register_source
+class RemoteOKAdapter(SourceAdapter):
+    """RemoteOK: un único JSON con todos los empleos remotos"""
+    name = "remoteok"
+    display_name = "RemoteOK"
+    cost = 1
+    timeout = 30
+    fetch_timeout = 60
+    supported_filters = ("remote_only",)
+
+    def fetch(self):
+        """Empleos recientes del feed de RemoteOK, uno a uno a medida que se decodifican"""
+        cutoff = time.time() - ENGINE_SETTINGS.get("remoteok_max_age_days", 7) * 86400
+        for job in self.iter_feed():
+            if not isinstance(job, dict):
+                continue
+            posted_at = self.posted_mark(job)  # epoch o fecha ISO; sin fecha se conserva
+            if posted_at is None or posted_at >= cutoff:
+                yield job
+
+    def iter_feed(self):
+        """Empleos crudos del feed; en modo streaming se decodifican a medida que llegan los bytes"""
+        streaming = ENGINE_SETTINGS.get("remoteok_streaming", True)
+        response = self.engine._source_get(self.name, "https://remoteok.io/api", stream=streaming)
+        try:
+            response.raise_for_status()
+            if not streaming:
+                yield from response.json()[1:]  # Saltar metadata
+                return
+            
+            chunks = response.iter_content(ENGINE_SETTINGS.get("stream_chunk_bytes", 64 * 1024))
+            yield from iter_json_array(chunks, skip=1)  # Saltar metadata
+        finally:
+            response.close()
+
+    def posted_mark(self, job):
+        if job.get("epoch"):
+            return int(job["epoch"])
+        try:
+            return int(job["date"])
+        except (KeyError, TypeError, ValueError):
+            published = parse_iso_date(job.get("date"))
+            return published.timestamp() if published else None
+
+    def normalize(self, job):
+        return JobRecord(
+            title=job.get("position", "N/A"),
+            company=job.get("company", "N/A"),
+            location=job.get("location", "Remote"),
+            salary_min=job.get("salary_min", 0),
+            salary_max=job.get("salary_max", 0),
+            url=f"https://remoteok.io/remote-jobs/{job.get('id', '')}",
+            description=str(job.get("description", ""))[:200],
+            source=self.display_name,
+            score=0
+        )
+
+    def full_description(self, job):
+        return job.get("description", "")
+
+
+@register_source
+class TheMuseAdapter(SourceAdapter):
+    """The Muse: endpoint público paginado, recorrido de los más recientes a los más antiguos"""
+    name = "themuse"
+    display_name = "The Muse"
+    cost = ENGINE_SETTINGS.get("themuse_max_pages", 20)
+    timeout = 60
+    fetch_timeout = 300             # Hasta themuse_max_pages páginas con rate limiting y reintentos
+    supported_filters = ("max_job_age_days",)
+
+    def iter_jobs(self, max_days=None, max_pages=None):
+        """Recorre perezosamente las páginas (más recientes primero) hasta pasar el corte de fecha"""
+        if max_days is None:
+            max_days = SEARCH_FILTERS.get("max_job_age_days", 30)
+        if max_pages is None:
+            max_pages = ENGINE_SETTINGS.get("themuse_max_pages", 20)
+        
+        cutoff = datetime.now(timezone.utc) - timedelta(days=max_days)
+        first_page = ENGINE_SETTINGS.get("themuse_first_page", 0)
+        
+        for page in range(first_page, first_page + max_pages):
+            response = self.engine._source_get(self.name, f"https://www.themuse.com/api/public/jobs?page={page}&descending=true")
+            response.raise_for_status()
+            data = response.json()
+            
+            jobs = data.get("results", [])
+            if not jobs:
+                return
+            
+            for job in jobs:
+                published = parse_iso_date(job.get("publication_date"))
+                if published and published < cutoff:
+                    return  # Ordenado por fecha: el resto de páginas es más antiguo
+                yield job
+            
+            if page + 1 >= data.get("page_count", page + 2):
+                return
+
+    def posted_mark(self, job):
+        published = parse_iso_date(job.get("publication_date"))
+        return published.timestamp() if published else None
+
+    def fetch(self):
+        """Recorre el catálogo reciente una vez; conserva lo obtenido si falla una página posterior"""
+        fetched = 0
+        try:
+            for job in self.iter_jobs():
+                fetched += 1
+                yield job
+        except (requests.RequestException, SourceUnavailableError) as e:
+            if not fetched:
+                raise
+            print(f"⚠️ The Muse: catálogo parcial ({fetched} empleos) - {e}")
+
+    def normalize(self, job):
+        location = job.get('locations', [{}])[0].get('name', 'Remote') if job.get('locations') else 'Remote'
+        return JobRecord(
+            title=job.get("name", "N/A"),
+            company=job.get("company", {}).get("name", "N/A"),
+            location=location,
+            salary_min=0,
+            salary_max=0,
+            url=job.get("refs", {}).get("landing_page", ""),
+            description=str(job.get("contents", ""))[:200],
+            source=self.display_name,
+            score=0
+        )
+
+    def full_description(self, job):
+        return job.get("contents", "")
+
+# ============================================================================
+# CATÁLOGO DE ENLACES DE BÚSQUEDA
+# ============================================================================
+
+def is_search_link(job):
+    """Indica si el registro es un enlace de búsqueda (no una vacante real)"""
+    return bool(job.get("_search_link"))
+
+
+class LinkCatalog:
+    """Enlaces de búsqueda generados desde SEARCH_LINK_TEMPLATES, memoizados por palabra clave
+
+    Los registros se construyen una sola vez por palabra clave y se comparten entre llamadas:
+    no deben modificarse (usar export_view o copy() para obtener una copia).
+    """
+
+    MAX_MEMO_ENTRIES = 4096
+
+    def __init__(self, templates, keyword_classes):
+        self.templates = [dict(template) for template in templates]
+        self.keyword_classes = {name: tuple(terms) for name, terms in keyword_classes.items()}
+        self._memo = {}
+
+    def keyword_classes_for(self, keyword):
+        keyword_lower = keyword.lower()
+        return {name for name, terms in self.keyword_classes.items() if any(term in keyword_lower for term in terms)}
+
+    def links(self, keyword, group=None):
+        """Enlaces para la palabra clave (opcionalmente solo un grupo: linkedin, indeed, specialized)"""
+        links = self._memo.get(keyword)
+        if links is None:
+            links = tuple(self._build(keyword))
+            if len(self._memo) >= self.MAX_MEMO_ENTRIES:
+                self._memo.clear()
+            self._memo[keyword] = links
+        if group is None:
+            return links
+        return tuple(link for link in links if link["_group"] == group)
+
+    def _build(self, keyword):
+        classes = self.keyword_classes_for(keyword)
+        values = {"keyword": keyword, "query": quote_plus(keyword)}
+        for template in self.templates:
+            if template["class"] is not None and template["class"] not in classes:
+                continue
+            link = JobRecord(
+                title=template["title"].format(**values),
+                company=template["company"],
+                location=template["location"],
+                description=template["description"].format(**values),
+                url=template["url"].format(**values),
+                salary_min=template.get("salary_min", 0),
+                salary_max=0,
+                source=template["source"],
+                score=template["score"],
+                _search_link=True,
+                _group=template["group"]
+            )
+            if template.get("posted_date"):
+                link["posted_date"] = template["posted_date"]
+            yield link
+
+    def links_for_queries(self, keywords):
+        """Enlaces de varias palabras clave sin repetir URL, en orden"""
+        unique = {}
+        for keyword in keywords:
+            for link in self.links(keyword):
+                unique.setdefault(link["url"], link)
+        return list(unique.values())
+
+# ============================================================================
+# PLANIFICACIÓN DE CONSULTAS
+# ============================================================================
+
+class QueryPlan:
+    """Consultas únicas a ejecutar y qué peticiones (categoría, palabra clave) atiende cada una
+
+    Las palabras clave se canonicalizan (minúsculas, sin acentos ni espacios repetidos), así que
+    "GIS Analyst" pedido por tres categorías se busca una sola vez y su resultado se reparte a las tres.
+    """
+
+    def __init__(self):
+        self.queries = []      # Texto a buscar (primera forma recibida)
+        self.requests = []     # (etiqueta, palabra clave pedida, índice en queries)
+        self._positions = {}
+
+    @staticmethod
+    def canonical(keyword):
+        return fold_text(keyword)
+
+    def add(self, keyword, tag=None):
+        key = self.canonical(keyword)
+        if not key:
+            return
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = len(self.queries)
+            self.queries.append(keyword.strip())
+        self.requests.append((tag, keyword, position))
+
+    @property
+    def saved_calls(self):
+        return len(self.requests) - len(self.queries)
+
+    def tags_for(self, query):
+        """Etiquetas de todas las peticiones que atiende una consulta única"""
+        position = self._positions.get(self.canonical(query))
+        return {tag for tag, _, request_position in self.requests if request_position == position}
+
+    def summary(self):
+        return f"🧭 Plan de búsqueda: {len(self.queries)} consultas únicas de {len(self.requests)} pedidas ({self.saved_calls} llamadas ahorradas)"
+
+
+def plan_queries(categories, additional_keyword=None):
+    """Plan para las categorías dadas; con palabra adicional busca también la palabra y cada combinación"""
+    plan = QueryPlan()
+    additional_keyword = (additional_keyword or "").strip()
+    for category in categories:
+        for keyword in JOB_CATEGORIES.get(category, []):
+            plan.add(keyword, category)
+            if additional_keyword:
+                plan.add(additional_keyword, category)
+                # "Revit" + "revit" no es una combinación nueva
+                if fold_text(additional_keyword) not in fold_text(keyword):
+                    plan.add(f"{keyword} {additional_keyword}", category)
+    return plan
+
+# ============================================================================
+# MOTOR DE BÚSQUEDA
+# ============================================================================
+
+class JobSearchEngine:
+    def __init__(self, incremental=False):
+        self.session = CachedSession(self._create_http_cache())
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        
+        # Ejecución concurrente: un pool para palabras clave y otro para fuentes
+        # (separados para que una búsqueda nunca espere a un hilo de su propio pool)
+        max_workers = ENGINE_SETTINGS.get("max_workers", 8)
+        http_adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=max_workers * 2)
+        self.session.mount("https://", http_adapter)
+        self.session.mount("http://", http_adapter)
+        self._keyword_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jobsearch-kw")
+        self._source_pool = ThreadPoolExecutor(max_workers=max_workers * 2, thread_name_prefix="jobsearch-src")
+        self._host_limits = {}
+        self._host_limits_lock = threading.Lock()
+        
+        # Límites y circuit breaker por fuente
+        self.source_guards = {}
+        for source in ENABLED_APIS:
+            limits = dict(SOURCE_LIMITS["default"])
+            limits.update(SOURCE_LIMITS.get(source, {}))
+            self.source_guards[source] = SourceGuard(source, limits)
+        
+        # Adaptadores habilitados (ordenados de más barato a más costoso) y sus feeds en memoria
+        self.adapters = {}
+        for source, enabled in ENABLED_APIS.items():
+            if not enabled:
+                continue
+            if source not in SOURCE_ADAPTERS:
+                print(f"⚠️ Fuente habilitada sin adaptador registrado: {source}")
+                continue
+            self.adapters[source] = SOURCE_ADAPTERS[source](self)
+        self.adapters = dict(sorted(self.adapters.items(), key=lambda item: item[1].cost))
+        self._adapters_by_display = {adapter.display_name: adapter for adapter in self.adapters.values()}
+        
+        # Modo incremental: solo empleos no vistos en ejecuciones anteriores
+        self.seen_store = None
+        if incremental:
+            self.seen_store = SeenJobStore(
+                SEEN_STORE_SETTINGS["path"],
+                SEEN_STORE_SETTINGS.get("bloom_capacity", 200000),
+                SEEN_STORE_SETTINGS.get("bloom_error_rate", 0.01)
+            )
+        
+        # Índice invertido de todos los empleos descargados en esta sesión
+        self.index = InvertedIndex()
+        
+        # Enlaces de búsqueda: canal separado de las vacantes reales
+        self.link_catalog = LinkCatalog(SEARCH_LINK_TEMPLATES, SEARCH_LINK_KEYWORD_CLASSES)
+        
+        # Persistencia de resultados entre sesiones (se abre al primer uso)
+        self.job_store = None
+        if JOB_STORE_SETTINGS.get("enabled", True):
+            self.job_store = JobStore(JOB_STORE_SETTINGS["path"], JOB_STORE_SETTINGS.get("batch_size", 500),
+                                      JOB_STORE_SETTINGS.get("max_body_chars", 5000))
+        
+        # Grupos de casi-duplicados de los feeds cargados (near_duplicate_groups)
+        self._duplicate_groups = {}
+        self._duplicate_groups_version = None
+        self._duplicate_groups_lock = threading.Lock()
+        
+        # Feeds completos compartidos por todas las palabras clave
+        ttl = ENGINE_SETTINGS.get("feed_snapshot_ttl_seconds")
+        self.snapshots = {
+            source: FeedSnapshot(adapter.display_name, self._snapshot_loader(adapter), ttl, self.index_category_terms)
+            for source, adapter in self.adapters.items()
+        }
+        self._snapshot_loads = {}           # Descarga en curso (o última) de cada snapshot
+        self._snapshot_loads_lock = threading.Lock()
+    
+    def _snapshot_loader(self, adapter):
+        """Carga y normaliza el feed una vez; en modo incremental descarta antes lo ya superado por la marca de agua
+
+        Cada empleo crudo se normaliza en cuanto llega de adapter.fetch, así que nunca se guarda la
+        lista completa de empleos crudos (con sus descripciones) junto a los registros normalizados.
+        """
+        def load():
+            cutoff = self.seen_store.high_water_mark(adapter.name) if self.seen_store is not None else None
+            records = []
+            for job in adapter.fetch():
+                if self.seen_store is not None:
+                    mark = adapter.posted_mark(job)
+                    self.seen_store.propose_high_water_mark(adapter.name, mark)
+                    if cutoff is not None and mark is not None and mark <= cutoff:
+                        continue
+                records.append(adapter.ingest(job))
+            get_salary_extractor().annotate(records)
+            get_near_duplicate_detector().signatures(records)
+            self.index.replace_source(adapter.display_name, records)
+            return records
+        return load
+    
+    def persist_results(self, jobs, mode, queries=0, started_at=None):
+        """Guarda los empleos puntuados y la ejecución en el almacén SQLite; devuelve el id o None"""
+        if self.job_store is None:
+            return None
+        try:
+            run_id = self.job_store.record_run(mode, jobs, queries, started_at)
+            print(f"🗄️ Resultados guardados (ejecución #{run_id}, {self.job_store.count()} empleos en total)")
+            return run_id
+        except sqlite3.Error as e:
+            print(f"⚠️ No se pudieron guardar los resultados: {e}")
+            return None
+    
+    def saved_runs(self, limit=20):
+        """Historial de ejecuciones guardadas (vacío si el almacén no está disponible)"""
+        if self.job_store is None:
+            return []
+        try:
+            return self.job_store.runs(limit)
+        except sqlite3.Error as e:
+            print(f"⚠️ No se pudo leer el almacén: {e}")
+            return []
+    
+    def search_saved(self, query, limit=100, since_days=None):
+        """Búsqueda de texto completo en los empleos guardados, sin red"""
+        if self.job_store is None:
+            return []
+        try:
+            return self.job_store.search(query, limit=limit, since_days=since_days)
+        except sqlite3.Error as e:
+            print(f"⚠️ No se pudo leer el almacén: {e}")
+            return []
+    
+    def load_results(self, run_id=None, limit=None):
+        """Ranking guardado de una ejecución anterior (la última por defecto), sin red"""
+        if self.job_store is None:
+            return []
+        try:
+            jobs = self.job_store.ranked(run_id, limit=limit or -1)
+        except sqlite3.Error as e:
+            print(f"⚠️ No se pudo leer el almacén: {e}")
+            return []
+        
+        # Reconstruir los componentes del score: la relevancia es lo que no explica la configuración actual
+        score_components = self._score_components()
+        for job in jobs:
+            parts = {component: points(job) for component, points in score_components.items()}
+            job["_score_parts"] = {"relevance": job["score"] - sum(parts.values()), **parts}
+        return jobs
+    
+    def filter_new_jobs(self, jobs):
+        """Devuelve solo los empleos reales no vistos antes y los marca como vistos"""
+        if self.seen_store is None:
+            return jobs
+        
+        new_jobs = []
+        for job in jobs:
+            if job.get("source") not in self._adapters_by_display:
+                continue  # Los enlaces de búsqueda no son vacantes
+            fingerprint = job_fingerprint(job)
+            if not self.seen_store.is_seen(fingerprint):
+                self.seen_store.add(fingerprint)
+                new_jobs.append(job)
+        return new_jobs
+    
+    def commit_seen_jobs(self):
+        """Guarda en disco las huellas y marcas de agua de esta ejecución"""
+        if self.seen_store is not None:
+            try:
+                self.seen_store.save()
+            except OSError as e:
+                print(f"⚠️ No se pudo guardar el registro de empleos vistos: {e}")
+    
+    def _create_http_cache(self):
+        """Crea la caché HTTP en disco si está habilitada"""
+        if not HTTP_CACHE_SETTINGS.get("enabled", True):
+            return None
+        try:
+            return HttpResponseCache(
+                HTTP_CACHE_SETTINGS["directory"],
+                HTTP_CACHE_SETTINGS.get("max_bytes", 50 * 1024 * 1024),
+                HTTP_CACHE_SETTINGS.get("default_ttl_seconds", 600),
+                HTTP_CACHE_SETTINGS.get("ttl_by_host", {})
+            )
+        except OSError as e:
+            print(f"⚠️ Caché HTTP deshabilitada: {e}")
+            return None
+    
+    def _host_semaphore(self, host):
+        """Devuelve el semáforo que limita las conexiones simultáneas a un host"""
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(ENGINE_SETTINGS.get("max_per_host", 4))
+            return self._host_limits[host]
+    
+    def _http_get(self, url, **kwargs):
+        """GET sobre la sesión compartida con límite por host y timeout por petición
+
+        En streaming el hueco del host se mantiene hasta leer el cuerpo completo o cerrar la
+        respuesta: la descarga del cuerpo es lo costoso, no las cabeceras.
+        """
+        kwargs.setdefault("timeout", ENGINE_SETTINGS.get("request_timeout", 10))
+        semaphore = self._host_semaphore(urlparse(url).netloc)
+        semaphore.acquire()
+        try:
+            response = self.session.get(url, **kwargs)
+        except BaseException:
+            semaphore.release()
+            raise
+        if not kwargs.get("stream") or getattr(response, "_content_consumed", False):
+            semaphore.release()  # Cuerpo ya en memoria (o servido desde la caché)
+            return response
+        return self._hold_host_slot(response, semaphore)
+    
+    @staticmethod
+    def _hold_host_slot(response, semaphore):
+        """Libera semaphore una sola vez, al agotar iter_content o al cerrar la respuesta"""
+        released = []
+        
+        def release():
+            if not released:
+                released.append(True)
+                semaphore.release()
+        
+        original_iter_content = response.iter_content
+        original_close = response.close
+        
+        def iter_content(chunk_size=1, decode_unicode=False):
+            try:
+                yield from original_iter_content(chunk_size, decode_unicode)
+            finally:
+                release()
+        
+        def close():
+            try:
+                original_close()
+            finally:
+                release()
+        
+        response.iter_content = iter_content
+        response.close = close
+        return response
+    
+    def _source_get(self, source, url, **kwargs):
+        """GET protegido por el rate limiter, los reintentos y el circuit breaker de la fuente"""
+        return self.source_guards[source].execute(lambda: self._http_get(url, **kwargs))
+    
+    def reset_source_guards(self):
+        """Cierra todos los circuitos al comenzar un nuevo barrido"""
+        for guard in self.source_guards.values():
+            guard.breaker.reset()
+    
+    def get_source_stats(self):
+        """Contadores por fuente (peticiones, reintentos, fallos, rechazos, estado del circuito)"""
+        return {source: guard.summary() for source, guard in self.source_guards.items()}
+    
+    def print_source_stats(self):
+        """Muestra en consola el estado de las fuentes y de la caché HTTP"""
+        for source, stats in self.get_source_stats().items():
+            if stats["requests"] or stats["rejected"]:
+                print(f"📡 {source}: {stats['requests']} peticiones • {stats['retries']} reintentos • "
+                      f"{stats['failures']} fallos • {stats['rejected']} rechazadas • circuito {stats['circuit']}")
+        if self.session.cache is not None:
+            cache_stats = self.session.cache.stats
+            print(f"💾 Caché HTTP: {cache_stats['hits']} aciertos • {cache_stats['misses']} fallos • "
+                  f"{cache_stats['revalidated']} revalidadas")
+    
+    def warm_snapshots(self):
+        """Carga los snapshots caducados en paralelo, cada uno con su presupuesto fetch_timeout
+
+        Devuelve las fuentes con snapshot listo. Las llamadas concurrentes comparten la misma
+        descarga, así que un barrido la lanza una sola vez aunque todas sus palabras clave esperen.
+        """
+        loads = {}
+        with self._snapshot_loads_lock:
+            for source, snapshot in self.snapshots.items():
+                load = self._snapshot_loads.get(source)
+                if load is None or (load.done() and not snapshot.is_fresh()):
+                    load = self._snapshot_loads[source] = self._source_pool.submit(snapshot.get_indexed)
+                loads[source] = load
+        
+        ready = set()
+        for source, load in loads.items():
+            adapter = self.adapters[source]
+            try:
+                load.result(timeout=adapter.fetch_timeout)
+                ready.add(source)
+            except FutureTimeoutError:
+                print(f"  ⏱️ {adapter.display_name}: la descarga del feed excedió {adapter.fetch_timeout}s")
+            except Exception as e:
+                print(f"⚠️ Error con {adapter.display_name}: {e}")
+        return ready
+    
+    def search_jobs(self, keyword):
+        """Busca empleos para una palabra clave específica - OPTIMIZADO PARA ÚLTIMAS VACANTES"""
+        print(f"🔍 Buscando ÚLTIMAS VACANTES para: '{keyword}'")
+        results = []
+        
+        # 1. APIs reales con filtro de fechas (adaptadores en paralelo, los baratos primero).
+        # La descarga tiene su propio presupuesto: adapter.timeout solo cubre la búsqueda en el snapshot
+        ready = self.warm_snapshots()
+        futures = [(adapter, self._source_pool.submit(adapter.search, keyword))
+                   for source, adapter in self.adapters.items() if source in ready]
+        for adapter, future in futures:  # Orden fijo de fuentes = resultados deterministas
+            try:
+                source_results = future.result(timeout=adapter.timeout)
+            except FutureTimeoutError:
+                print(f"  ⏱️ {adapter.display_name} excedió el tiempo límite para '{keyword}'")
+                continue
+            if source_results:
+                results.extend(source_results)
         
-        # 1. APIs reales con filtro de fechas
-        if ENABLED_APIS.get("remoteok", True):
-            print("  📡 RemoteOK API (últimos 7 días)...")
-            remoteok_results = self.search_remoteok(keyword)
-            if remoteok_results:
-                results.extend(remoteok_results)
-            
-        if ENABLED_APIS.get("themuse", True):
-            print("  📡 The Muse API...")
-            themuse_results = self.search_themuse(keyword)
-            if themuse_results:
-                results.extend(themuse_results)
-        
-        # 2. Enlaces de LinkedIn optimizados (últimas 72 horas)
-        print("  🔗 Generando enlaces LinkedIn (últimas 72h)...")
-        linkedin_searches = self.generate_linkedin_searches(keyword)
-        results.extend(linkedin_searches)
-        
-        # 3. Enlaces de Indeed optimizados (últimos 3 días)
-        print("  🔗 Generando enlaces Indeed (últimos 3 días)...")
-        indeed_searches = self.generate_indeed_searches(keyword)
-        results.extend(indeed_searches)
-        
-        # 4. Sitios especializados con fechas recientes
-        print("  🔗 Sitios especializados (vacantes recientes)...")
-        specialized_searches = self.generate_specialized_searches(keyword)
-        results.extend(specialized_searches)
-        
-        print(f"✅ {len(results)} empleos/enlaces encontrados")
+        # Los enlaces de búsqueda (LinkedIn, Indeed, sitios especializados) van por su propio canal: search_links
+        print(f"✅ {len(results)} empleos encontrados")
         return results
     
+    def search_links(self, keyword):
+        """Enlaces de búsqueda para la palabra clave (catálogo memoizado, sin red)"""
+        return self.link_catalog.links(keyword)
+    
+    def search_local(self, query, as_you_type=False):
+        """Consulta el índice local (palabras, "frases", prefijo*) sin tocar la red"""
+        return [record.copy() for record in self.index.search(query, as_you_type)]
+    
+    def search_keyword(self, keyword):
+        """Palabra clave: responde desde el índice local si ya contiene coincidencias; si no, consulta las fuentes
+
+        El índice solo se usa mientras todos los snapshots siguen vigentes; si alguno caducó,
+        search_jobs lo vuelve a descargar y el índice se actualiza con esa descarga.
+        """
+        snapshots_fresh = all(snapshot.is_fresh() for snapshot in self.snapshots.values())
+        local_jobs = self.search_local(f'"{keyword}"') if snapshots_fresh and len(self.index) else []
+        if not local_jobs:
+            return self.search_jobs(keyword)
+        
+        print(f"⚡ {len(local_jobs)} empleos desde el índice local para '{keyword}'")
+        return local_jobs
+    
+    def search_source(self, source, keyword):
+        """Busca una palabra clave en una sola fuente registrada"""
+        adapter = self.adapters.get(source)
+        return adapter.search(keyword) if adapter else []
+    
     def search_remoteok(self, keyword):
-        """Busca en RemoteOK API - Filtra por empleos recientes"""
-        try:
-            response = self.session.get("https://remoteok.io/api", timeout=10)
-            if response.status_code == 200:
-                jobs = response.json()[1:]  # Saltar metadata
-                
-                relevant_jobs = []
-                for job in jobs:
-                    if self.is_relevant_job(job, keyword) and self.is_recent_job(job):
-                        relevant_jobs.append(self.normalize_job(job, "RemoteOK"))
-                        
-                return relevant_jobs[:10]  # Máximo 10 por keyword
-                
-        except Exception as e:
-            print(f"⚠️ Error con RemoteOK: {e}")
-            return []
+        """Busca en RemoteOK API - Filtra por empleos recientes sobre el snapshot en memoria"""
+        return self.search_source("remoteok", keyword)
     
     def search_themuse(self, keyword):
-        """Busca en The Muse API"""
-        try:
-            url = f"https://www.themuse.com/api/public/jobs?page=1&api_key=&category={quote_plus(keyword)}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                jobs = data.get("results", [])
-                
-                relevant_jobs = []
-                for job in jobs[:10]:
-                    relevant_jobs.append(self.normalize_job(job, "The Muse"))
-                    
-                return relevant_jobs
-                
-        except Exception as e:
-            print(f"⚠️ Error con The Muse: {e}")
-            return []
+        """Busca en The Muse API sobre el catálogo en memoria"""
+        return self.search_source("themuse", keyword)
     
     def generate_linkedin_searches(self, keyword):
         """Genera enlaces optimizados de LinkedIn Jobs"""
-        try:
-            base_url = "https://www.linkedin.com/jobs/search/"
-            searches = []
-            
-            # Búsqueda básica remoto - ÚLTIMAS 72 HORAS
-            remote_url = f"{base_url}?keywords={quote_plus(keyword)}&location=Worldwide&f_WT=2&f_TPR=r259200"
-            searches.append({
-                'title': f"LinkedIn: {keyword} (Remote - Últimas 72h)",
-                'company': "LinkedIn Jobs", 
-                'location': "Remote Worldwide",
-                'description': f"Búsqueda en LinkedIn para '{keyword}' - Solo empleos remotos de las ÚLTIMAS 72 HORAS.",
-                'url': remote_url,
-                'salary_min': 0,
-                'salary_max': 0,
-                'source': 'LinkedIn (Remote)',
-                'posted_date': 'Últimas 72 horas',
-                'score': 90
-            })
-            
-            # Búsqueda con ubicaciones específicas - ÚLTIMAS 72 HORAS
-            locations = ["United States", "Canada", "United Kingdom"]
-            for location in locations[:2]:
-                location_url = f"{base_url}?keywords={quote_plus(keyword)}&location={quote_plus(location)}&f_TPR=r259200"
-                searches.append({
-                    'title': f"LinkedIn: {keyword} ({location} - Últimas 72h)",
-                    'company': "LinkedIn Jobs",
-                    'location': location,
-                    'description': f"Búsqueda en LinkedIn para '{keyword}' en {location} - ÚLTIMAS 72 HORAS.",
-                    'url': location_url,
-                    'salary_min': 0,
-                    'salary_max': 0,
-                    'source': 'LinkedIn',
-                    'posted_date': 'Últimas 72 horas',
-                    'score': 85
-                })
-            
-            return searches
-            
-        except Exception as e:
-            print(f"❌ Error generando enlaces LinkedIn: {e}")
-            return []
+        return [link.copy() for link in self.link_catalog.links(keyword, "linkedin")]
     
     def generate_indeed_searches(self, keyword):
         """Genera enlaces optimizados de Indeed"""
-        try:
-            base_url = "https://www.indeed.com/jobs"
-            searches = []
-            
-            # Búsqueda remota - ÚLTIMOS 3 DÍAS
-            remote_url = f"{base_url}?q={quote_plus(keyword)}&l=Remote&fromage=3&sort=date"
-            searches.append({
-                'title': f"Indeed: {keyword} (Remote - Últimos 3 días)",
-                'company': "Indeed Jobs",
-                'location': "Remote",
-                'description': f"Búsqueda en Indeed para '{keyword}' - Empleos remotos, ÚLTIMOS 3 DÍAS.",
-                'url': remote_url,
-                'salary_min': 0,
-                'salary_max': 0,
-                'source': 'Indeed (Remote)',
-                'posted_date': 'Últimos 3 días',
-                'score': 85
-            })
-            
-            # Búsqueda con salario mínimo - ÚLTIMOS 3 DÍAS
-            salary_url = f"{base_url}?q={quote_plus(keyword)}&l=&fromage=3&sort=date&salary=%2450%2C000"
-            searches.append({
-                'title': f"Indeed: {keyword} ($50K+ - Últimos 3 días)",
-                'company': "Indeed Jobs", 
-                'location': "Any",
-                'description': f"Búsqueda en Indeed para '{keyword}' - Salario mínimo $50,000, ÚLTIMOS 3 DÍAS.",
-                'url': salary_url,
-                'salary_min': 50000,
-                'salary_max': 0,
-                'source': 'Indeed (Salary)',
-                'posted_date': 'Últimos 3 días',
-                'score': 80
-            })
-            
-            return searches
-            
-        except Exception as e:
-            print(f"❌ Error generando enlaces Indeed: {e}")
-            return []
+        return [link.copy() for link in self.link_catalog.links(keyword, "indeed")]
     
     def generate_specialized_searches(self, keyword):
         """Genera enlaces a sitios especializados según el keyword"""
-        try:
-            searches = []
-            keyword_lower = keyword.lower()
-            
-            # Para trabajos remotos generales (siempre incluir)
-            searches.append({
-                'title': f"We Work Remotely: {keyword}",
-                'company': "We Work Remotely",
-                'location': "Remote Global",
-                'description': f"Mayor sitio de empleos remotos para '{keyword}'.",
-                'url': f"https://weworkremotely.com/remote-jobs/search?term={quote_plus(keyword)}",
-                'salary_min': 0,
-                'salary_max': 0,
-                'source': 'WeWorkRemotely',
-                'score': 55
-            })
-            
-            # Para BIM/CAD/Engineering - ÚLTIMAS VACANTES
-            if any(term in keyword_lower for term in ['bim', 'revit', 'autocad', 'civil', 'tekla', 'navisworks', 'engineer', 'cad']):
-                searches.extend([
-                    {
-                        'title': f"Indeed Colombia: {keyword} (Últimos 3 días)",
-                        'company': "Indeed Colombia",
-                        'location': "Colombia",
-                        'description': f"Empleos en Colombia para '{keyword}' - ÚLTIMOS 3 DÍAS.",
-                        'url': f"https://co.indeed.com/jobs?q={quote_plus(keyword)}&l=Colombia&fromage=3&sort=date",
-                        'salary_min': 0,
-                        'salary_max': 0,
-                        'source': 'Indeed Colombia',
-                        'score': 85
-                    },
-                    {
-                        'title': f"LinkedIn Colombia: {keyword} (Últimas 72h)",
-                        'company': "LinkedIn Colombia",
-                        'location': "Colombia",
-                        'description': f"Red profesional en Colombia para '{keyword}' - ÚLTIMAS 72 HORAS.",
-                        'url': f"https://www.linkedin.com/jobs/search/?keywords={quote_plus(keyword)}&location=Colombia&f_TPR=r259200",
-                        'salary_min': 0,
-                        'salary_max': 0,
-                        'source': 'LinkedIn Colombia',
-                        'score': 90
-                    },
-                    {
-                        'title': f"ElEmpleo Colombia: {keyword} (Recientes)",
-                        'company': "ElEmpleo Colombia",
-                        'location': "Colombia",
-                        'description': f"Principal sitio de empleos en Colombia para '{keyword}' - VACANTES RECIENTES.",
-                        'url': f"https://www.elempleo.com/co/ofertas-empleo?q={quote_plus(keyword)}&l=Colombia",
-                        'salary_min': 0,
-                        'salary_max': 0,
-                        'source': 'ElEmpleo Colombia',
-                        'score': 95
-                    }
-                ])
-            
-            # Para tech/software/programming
-            if any(term in keyword_lower for term in ['software', 'developer', 'engineer', 'python', 'javascript', 'tech', 'programming', 'c#', 'dynamo']):
-                searches.extend([
-                    {
-                        'title': f"AngelList: {keyword}",
-                        'company': "AngelList (Startups)",
-                        'location': "Global",
-                        'description': f"Empleos en startups para '{keyword}'.",
-                        'url': f"https://angel.co/jobs#find/f!%7B%22keywords%22%3A%5B%22{quote_plus(keyword)}%22%5D%7D",
-                        'salary_min': 0,
-                        'salary_max': 0,
-                        'source': 'AngelList',
-                        'score': 60
-                    },
-                    {
-                        'title': f"Stack Overflow Jobs: {keyword}",
-                        'company': "Stack Overflow",
-                        'location': "Global",
-                        'description': f"Empleos técnicos para '{keyword}'.",
-                        'url': f"https://stackoverflow.com/jobs?q={quote_plus(keyword)}&r=true",
-                        'salary_min': 0,
-                        'salary_max': 0,
-                        'source': 'StackOverflow',
-                        'score': 65
-                    }
-                ])
-                
-            # Para GIS/Data/Analytics
-            if any(term in keyword_lower for term in ['gis', 'arcgis', 'qgis', 'data', 'analyst', 'power bi', 'spatial']):
-                searches.append({
-                    'title': f"GIS Jobs: {keyword}",
-                    'company': "GIS Jobs Clearinghouse",
-                    'location': "Global",
-                    'description': f"Empleos especializados en GIS para '{keyword}'.",
-                    'url': f"https://www.gjc.org/jobs/search?query={quote_plus(keyword)}",
-                    'salary_min': 0,
-                    'salary_max': 0,
-                    'source': 'GIS Jobs',
-                    'score': 70
-                })
-            
-            # Para empleos en Colombia específicamente
-            searches.extend([
-                {
-                    'title': f"ElEmpleo.com: {keyword}",
-                    'company': "ElEmpleo Colombia",
-                    'location': "Colombia",
-                    'description': f"Principal sitio de empleos en Colombia para '{keyword}'.",
-                    'url': f"https://www.elempleo.com/co/ofertas-empleo?q={quote_plus(keyword)}&l=Colombia",
-                    'salary_min': 0,
-                    'salary_max': 0,
-                    'source': 'ElEmpleo Colombia',
-                    'score': 80
-                },
-                {
-                    'title': f"Computrabajo Colombia: {keyword}",
-                    'company': "Computrabajo",
-                    'location': "Colombia",
-                    'description': f"Empleos en Colombia y LATAM para '{keyword}'.",
-                    'url': f"https://www.computrabajo.com.co/trabajo-de-{quote_plus(keyword)}-en-colombia",
-                    'salary_min': 0,
-                    'salary_max': 0,
-                    'source': 'Computrabajo',
-                    'score': 75
-                }
-            ])
-            
-            return searches
-            
-        except Exception as e:
-            print(f"❌ Error generando enlaces especializados: {e}")
-            return []
+        return [link.copy() for link in self.link_catalog.links(keyword, "specialized")]
+    
+    def _raw_job_text(self, job):
+        """Texto en minúsculas (título, empresa, descripción) de un empleo crudo de cualquier fuente"""
+        if not isinstance(job, (dict, JobRecord)):
+            return ""
+        company = job.get('company', '')
+        if isinstance(company, dict):  # The Muse: {"name": ...}
+            company = company.get('name', '')
+        title = job.get('position', job.get('name', ''))
+        description = job.get('description', job.get('contents', ''))
+        return f"{title} {company} {description}".lower()
     
     def is_relevant_job(self, job, keyword):
         """Verifica si un empleo es relevante para el keyword"""
-        text = ""
-        if isinstance(job, dict):
-            text = f"{job.get('position', '')} {job.get('company', '')} {job.get('description', '')}".lower()
+        folded = job.get("_text") if isinstance(job, (dict, JobRecord)) else None
+        if folded is None:
+            return keyword.lower() in self._raw_job_text(job)
         
-        keyword_lower = keyword.lower()
-        return keyword_lower in text
+        keyword_folded = fold_text(keyword)
+        return (keyword_folded in folded.title or keyword_folded in folded.company
+                or keyword_folded in folded.description)
+    
+    def index_category_terms(self, records):
+        """Recorre cada empleo normalizado una sola vez y devuelve {término de JOB_CATEGORIES: [posiciones]}"""
+        term_index = {}
+        for position, record in enumerate(records):
+            for term_id in {term_id for term_id, _, _ in get_term_counts(record)}:
+                term_index.setdefault(term_id, []).append(position)
+        return term_index
     
     def is_recent_job(self, job, max_days=7):
         """Verifica si un empleo es reciente (últimos 7 días por defecto)"""
@@ -564,102 +3119,186 @@ class JobSearchEngine:
             # Si hay error procesando la fecha, incluir el empleo
             return True
     
-    def calculate_relevance_score(self, job, search_terms):
-        """Calcula puntuación de relevancia basada en múltiples términos"""
-        if not isinstance(search_terms, list):
-            search_terms = [search_terms]
-        
-        text = ""
-        if isinstance(job, dict):
-            title_text = job.get('position', job.get('title', '')).lower()
-            company_text = job.get('company', '').lower() 
-            desc_text = str(job.get('description', '')).lower()
-            text = f"{title_text} {company_text} {desc_text}"
-        
-        score = 0
-        for term in search_terms:
-            term_lower = term.lower()
-            
-            # Puntuación por aparición en título (más importante)
-            if term_lower in title_text:
-                score += 3
-            
-            # Puntuación por aparición en empresa
-            if term_lower in company_text:
-                score += 2
-            
-            # Puntuación por aparición en descripción
-            if term_lower in desc_text:
-                score += 1
-        
-        return score
-    
     def normalize_job(self, job, source):
         """Normaliza la estructura de datos de diferentes fuentes"""
-        if source == "RemoteOK":
-            return {
-                "title": job.get("position", "N/A"),
-                "company": job.get("company", "N/A"),
-                "location": job.get("location", "Remote"),
-                "salary_min": job.get("salary_min", 0),
-                "salary_max": job.get("salary_max", 0),
-                "url": f"https://remoteok.io/remote-jobs/{job.get('id', '')}",
-                "description": str(job.get("description", ""))[:200],
-                "source": source,
-                "score": 0
-            }
-        elif source == "The Muse":
-            location = job.get('locations', [{}])[0].get('name', 'Remote') if job.get('locations') else 'Remote'
-            return {
-                "title": job.get("name", "N/A"),
-                "company": job.get("company", {}).get("name", "N/A"),
-                "location": location,
-                "salary_min": 0,
-                "salary_max": 0,
-                "url": job.get("refs", {}).get("landing_page", ""),
-                "description": str(job.get("contents", ""))[:200],
-                "source": source,
-                "score": 0
-            }
+        adapter = self._adapters_by_display.get(source) or self.adapters.get(source)
+        if adapter:
+            return adapter.normalize(job)
         
         return job
     
+    def iter_search(self, keywords, should_continue=None, on_progress=None):
+        """Etapa de búsqueda: (palabra clave, empleos normalizados) en el orden de keywords
+
+        Como máximo pipeline_max_in_flight consultas pendientes a la vez: si el consumidor va más
+        lento no se lanzan más búsquedas (buffer acotado entre la red y las etapas siguientes).
+        Las consultas terminadas antes que la primera pendiente esperan su turno, así el resultado
+        (deduplicado, desempates del ranking) no depende de qué hilo termina antes.
+        """
+        keywords = list(keywords)
+        self.warm_snapshots()  # Una descarga por fuente antes de repartir las palabras clave
+        max_in_flight = max(1, ENGINE_SETTINGS.get("pipeline_max_in_flight", 16))
+        pending = deque()
+        position = done = 0
+        
+        while position < len(keywords) or pending:
+            while position < len(keywords) and len(pending) < max_in_flight:
+                if should_continue is not None and not should_continue():
+                    position = len(keywords)
+                    break
+                pending.append((keywords[position], self._keyword_pool.submit(self.search_jobs, keywords[position])))
+                position += 1
+            if not pending:
+                return
+            
+            keyword, future = pending.popleft()
+            results = future.result()
+            done += 1
+            if on_progress is not None:
+                on_progress(done, len(keywords), keyword)
+            yield keyword, results
+    
+    def iter_unique(self, batches):
+        """Etapa de deduplicado: descarta lo ya emitido por URL/título-empresa y resuelve los casi-duplicados
+
+        Cada casi-duplicado se sustituye por el registro canónico de su grupo (con salario, luego la
+        descripción más completa), calculado sobre todos los feeds cargados y emitido una sola vez.
+        """
+        seen_urls = set()
+        emitted_groups = set()
+        for batch in batches:
+            groups = self.near_duplicate_groups()
+            unique_jobs = []
+            for job in self._remove_exact_duplicates(batch, seen_urls):
+                canonical = groups.get(job.get("url", "")) if job.get("url") else None
+                if canonical is not None:
+                    if canonical.get("url", "") in emitted_groups:
+                        continue
+                    emitted_groups.add(canonical.get("url", ""))
+                    job = canonical.copy()
+                    self._remove_exact_duplicates([job], seen_urls)  # Registrar también sus claves
+                unique_jobs.append(job)
+            if unique_jobs:
+                yield unique_jobs
+    
+    def near_duplicate_groups(self):
+        """{url: registro canónico} de cada empleo con casi-duplicados en los feeds cargados
+
+        Se recalcula solo cuando cambia algún snapshot. Se agrupan copias de los registros para no
+        modificar los del snapshot mientras otros hilos los copian.
+        """
+        if not ENGINE_SETTINGS.get("near_duplicate_threshold", 0.8):
+            return {}
+        version = tuple((snapshot.fetch_count, snapshot.jobs is None) for snapshot in self.snapshots.values())
+        with self._duplicate_groups_lock:
+            if version != self._duplicate_groups_version:
+                groups = {}
+                for canonical in self.remove_near_duplicates([record.copy() for record in self.loaded_records()]):
+                    duplicate_urls = canonical.get("_duplicate_urls")
+                    if duplicate_urls:
+                        for url in [canonical.get("url", "")] + duplicate_urls:
+                            groups[url] = canonical
+                self._duplicate_groups = groups
+                self._duplicate_groups_version = version
+            return self._duplicate_groups
+    
+    def iter_filters(self, batches):
+        """Etapa de filtros: apply_filters lote a lote"""
+        for batch in batches:
+            filtered = self.apply_filters(batch)
+            if filtered:
+                yield filtered
+    
+    def iter_scored(self, batches, search_terms=None):
+        """Etapa de ranking: puntúa cada lote con las estadísticas BM25 de los feeds descargados
+
+        Las estadísticas (IDF, longitudes medias) se fijan con el primer lote, así que las
+        puntuaciones de lotes distintos son comparables y un TopKRanker puede ir acumulándolos.
+        """
+        if search_terms and not isinstance(search_terms, list):
+            search_terms = [search_terms]
+        scorer = None
+        for batch in batches:
+            if search_terms and scorer is None:
+                scorer = BM25Scorer(search_terms).fit(self.loaded_records() or batch)
+            yield self.score_jobs(batch, search_terms, scorer)
+    
+    def stream_search(self, keywords, search_terms=None, should_continue=None, on_progress=None):
+        """Pipeline completo búsqueda → deduplicado → filtros → ranking, en lotes a medida que llegan
+
+        Cada etapa (iter_search, iter_unique, iter_filters, iter_scored) es un generador de lotes y se
+        pueden encadenar por separado; los primeros resultados están listos sin esperar al barrido completo.
+        """
+        batches = (results for _, results in self.iter_search(keywords, should_continue, on_progress))
+        return self.iter_scored(self.iter_filters(self.iter_unique(batches)), search_terms)
+    
+    def loaded_records(self):
+        """Empleos normalizados de los snapshots ya cargados (sin descargar nada)"""
+        return [record for snapshot in self.snapshots.values() if snapshot.jobs is not None for record in snapshot.jobs]
+    
     def search_all_categories(self):
-        """Busca empleos en todas las categorías configuradas"""
+        """Busca empleos en todas las categorías configuradas
+
+        Un solo pipeline: todas las búsquedas en paralelo, deduplicado global, etiquetado con cada
+        categoría a la que pertenece el empleo y un único ranking con relevancia por categoría.
+        """
         print("🚀 INICIANDO BÚSQUEDA COMPLETA DE EMPLEOS")
         print("=" * 60)
         
-        all_results = []
+        started_at = time.time()
+        self.reset_source_guards()
+        
+        # ✅ TODOS los keywords de todas las categorías, en paralelo y una sola vez cada uno
+        plan = plan_queries(JOB_CATEGORIES)
+        print(plan.summary())
+        
+        # Unir resultados en streaming recordando qué categorías encontraron cada empleo
+        found_in = {}
+        def tagged_batches():
+            for query, results in self.iter_search(plan.queries):
+                categories = plan.tags_for(query)
+                for job in results:
+                    found_in.setdefault(job_fingerprint(job), set()).update(categories)
+                yield results
+        
+        all_results = [job for batch in self.iter_filters(self.iter_unique(tagged_batches())) for job in batch]
+        for job in all_results:
+            categories = found_in.get(job_fingerprint(job), set()).union(match_categories(job))
+            job["categories"] = [category for category in JOB_CATEGORIES if category in categories]
+        all_results = self.score_jobs_by_category(all_results)
+        self.persist_results(all_results, "completa", len(plan.queries), started_at)
         
-        for category, keywords in JOB_CATEGORIES.items():
+        print(f"📊 {len(all_results)} empleos únicos en total")
+        print(f"🔗 {len(self.link_catalog.links_for_queries(plan.queries))} enlaces de búsqueda disponibles")
+        
+        # Top 3 por categoría a partir del mismo ranking
+        category_tops = {category: TopKRanker(3) for category in JOB_CATEGORIES}
+        for job in all_results:
+            for category in job["categories"]:
+                category_tops[category].push(job)
+        
+        for category, category_top in category_tops.items():
             print(f"\n🎯 CATEGORÍA: {category}")
             print("-" * 40)
-            
-            category_results = []
-            for keyword in keywords:  # ✅ TODOS los keywords por categoría
-                results = self.search_jobs(keyword)
-                category_results.extend(results)
-            
-            # Procesar resultados de la categoría
-            unique_results = self.remove_duplicates(category_results)
-            filtered_results = self.apply_filters(unique_results)
-            ranked_results = self.rank_jobs(filtered_results, keywords)  # ✅ TODOS los keywords
-            
-            print(f"📊 {len(ranked_results)} empleos únicos encontrados")
+            print(f"📊 {len(category_top)} empleos únicos encontrados")
             
             # Mostrar los top 3 de la categoría
-            for i, job in enumerate(ranked_results[:3], 1):
+            for i, job in enumerate(category_top.top(), 1):
                 self.display_job(job, f"#{i}")
-            
-            all_results.extend(ranked_results)
         
+        self.print_source_stats()
         return all_results
     
     def remove_duplicates(self, jobs):
-        """Elimina empleos duplicados"""
-        seen_urls = set()
+        """Elimina empleos duplicados: misma URL o título-empresa y casi-duplicados (NearDuplicateDetector)"""
+        unique_jobs = self._remove_exact_duplicates(jobs, set())
+        if ENGINE_SETTINGS.get("near_duplicate_threshold", 0.8):
+            unique_jobs = self.remove_near_duplicates(unique_jobs)
+        return unique_jobs
+    
+    def _remove_exact_duplicates(self, jobs, seen_urls):
+        """Empleos cuya URL y título-empresa no están aún en seen_urls (que se actualiza)"""
         unique_jobs = []
-        
         for job in jobs:
             url = job.get('url', '')
             title_company = f"{job.get('title', '')}-{job.get('company', '')}"
@@ -668,29 +3307,61 @@ class JobSearchEngine:
                 seen_urls.add(url)
                 seen_urls.add(title_company)
                 unique_jobs.append(job)
-        
         return unique_jobs
     
+    def remove_near_duplicates(self, jobs, threshold=None):
+        """Fusiona casi-duplicados entre fuentes (MinHash/LSH) dejando un registro canónico por grupo"""
+        positions = [i for i, job in enumerate(jobs) if job.get("source") in self._adapters_by_display]
+        if len(positions) < 2:
+            return jobs  # Los enlaces de búsqueda no se comparan
+        
+        candidates = [jobs[i] for i in positions]
+        replacement = {}
+        for group in get_near_duplicate_detector(threshold).clusters(candidates):
+            members = [candidates[member] for member in group]
+            canonical = NearDuplicateDetector.canonical(members)
+            if len(members) > 1:
+                canonical["_duplicate_urls"] = [job.get("url", "") for job in members if job is not canonical]
+            replacement[positions[group[0]]] = canonical
+            for member in group[1:]:
+                replacement[positions[member]] = None
+        
+        return [replacement.get(i, job) for i, job in enumerate(jobs) if replacement.get(i, job) is not None]
+    
     def apply_filters(self, jobs):
-        """Aplica filtros configurados"""
+        """Aplica filtros configurados (devuelve JobRecords: los dicts recibidos se convierten)"""
+        min_salary = SEARCH_FILTERS.get("min_salary", 0)
+        remote_only = SEARCH_FILTERS.get("remote_only", False)
+        exclude_agencies = SEARCH_FILTERS.get("exclude_agencies", True)
+        max_job_age_days = SEARCH_FILTERS.get("max_job_age_days", 0)
+        oldest_posted_at = time.time() - max_job_age_days * 86400
+        remote_words = ["remote", "remoto", "worldwide"]
+        agency_keywords = ["staffing", "recruiting", "headhunter", "talent acquisition"]
         filtered = []
         
-        for job in jobs:
+        for job in map(as_job_record, jobs):
             # Filtro de salario mínimo
-            if SEARCH_FILTERS.get("min_salary", 0) > 0:
-                if job.get("salary_min", 0) > 0 and job.get("salary_min", 0) < SEARCH_FILTERS["min_salary"]:
-                    continue
+            if min_salary > 0 and 0 < job.salary_min < min_salary:
+                continue
             
-            # Filtro solo remotos
-            if SEARCH_FILTERS.get("remote_only", False):
-                location = job.get("location", "").lower()
-                if not any(word in location for word in ["remote", "remoto", "worldwide"]):
-                    continue
+            # Filtro solo remotos (omitido si la fuente solo publica remotos)
+            if remote_only:
+                adapter = self._adapters_by_display.get(job.source)
+                if not (adapter and "remote_only" in adapter.supported_filters):
+                    location = get_normalized_text(job).location
+                    if not any(word in location for word in remote_words):
+                        continue
+            
+            # Antigüedad máxima (omitida si la fuente ya corta por fecha en origen)
+            if max_job_age_days and job.get("_posted_at") is not None:
+                adapter = self._adapters_by_display.get(job.source)
+                if not (adapter and "max_job_age_days" in adapter.supported_filters):
+                    if job.get("_posted_at") < oldest_posted_at:
+                        continue
             
             # Excluir agencias
-            if SEARCH_FILTERS.get("exclude_agencies", True):
-                company = job.get("company", "").lower()
-                agency_keywords = ["staffing", "recruiting", "headhunter", "talent acquisition"]
+            if exclude_agencies:
+                company = get_normalized_text(job).company
                 if any(keyword in company for keyword in agency_keywords):
                     continue
                     
@@ -699,34 +3370,97 @@ class JobSearchEngine:
         return filtered
     
     def rank_jobs(self, jobs, search_terms=None):
-        """Rankea empleos por relevancia"""
-        for job in jobs:
-            score = 0
-            
-            # Puntuación por relevancia de términos de búsqueda
-            if search_terms:
-                relevance_score = self.calculate_relevance_score(job, search_terms)
-                score += relevance_score * 5  # Multiplicar para dar más peso a la relevancia
-            
-            # Puntuación por salario
-            salary_min = job.get("salary_min", 0)
-            if salary_min >= SALARY_PREFERENCES.get("target_usd", 100000):
-                score += 50
-            elif salary_min >= SALARY_PREFERENCES.get("preferred_usd", 60000):
-                score += 30
-            elif salary_min >= SALARY_PREFERENCES.get("minimum_usd", 30000):
-                score += 10
-                
-            # Puntuación por ubicación
-            location = job.get("location", "").lower()
-            for i, pref_location in enumerate(PREFERRED_LOCATIONS):
-                if pref_location.lower() in location:
-                    score += (10 - i)
-                    break
-                    
-            job["score"] = score
+        """Rankea empleos por relevancia (score_jobs + TopKRanker, ranking completo)"""
+        return TopKRanker().extend(self.score_jobs(jobs, search_terms)).ranked()
+    
+    def score_jobs(self, jobs, search_terms=None, scorer=None):
+        """Asigna 'score' a cada empleo sin ordenar y devuelve la lista de JobRecords puntuados
+
+        Los componentes (relevancia BM25, salario, ubicación, fuente) se guardan en '_score_parts'
+        para que rescore_jobs recalcule solo los afectados por un cambio de configuración.
+        scorer: BM25Scorer ya ajustado (fit) para puntuar lotes con estadísticas comunes.
+        """
+        jobs = [as_job_record(job) for job in jobs]
+        
+        # Relevancia BM25 de todos los empleos contra los términos en una sola pasada
+        relevance_scores = None
+        if search_terms:
+            if not isinstance(search_terms, list):
+                search_terms = [search_terms]
+            relevance_scores = (scorer or BM25Scorer(search_terms)).score(jobs)
+        bm25_weight = ENGINE_SETTINGS.get("bm25_weight", 10)
+        score_components = tuple(self._score_components().items())
+        
+        for position, job in enumerate(jobs):
+            parts = {"relevance": round(relevance_scores[position] * bm25_weight) if relevance_scores is not None else 0}
+            for component, points in score_components:
+                parts[component] = points(job)
+            job._score_parts = parts
+            job.score = sum(parts.values())
             
-        return sorted(jobs, key=lambda x: x.get("score", 0), reverse=True)
+        return jobs
+    
+    def score_jobs_by_category(self, jobs):
+        """score_jobs con relevancia por categoría: cada empleo toma su mejor BM25 entre sus 'categories'
+
+        La BM25 de cada categoría se calcula sobre todo el conjunto para que las puntuaciones sean comparables.
+        """
+        jobs = self.score_jobs(jobs)
+        bm25_weight = ENGINE_SETTINGS.get("bm25_weight", 10)
+        relevance = [0] * len(jobs)
+        for category, terms in JOB_CATEGORIES.items():
+            members = [position for position, job in enumerate(jobs) if category in job.get("categories", ())]
+            if not members:
+                continue
+            scores = BM25Scorer(terms).score(jobs)
+            for position in members:
+                relevance[position] = max(relevance[position], round(scores[position] * bm25_weight))
+        
+        for job, points in zip(jobs, relevance):
+            job._score_parts["relevance"] = points
+            job.score = sum(job._score_parts.values())
+        return jobs
+    
+    def rescore_jobs(self, jobs, components):
+        """Recalcula solo los componentes indicados ('salary', 'location', 'source') y el score total"""
+        score_components = self._score_components()
+        jobs = [as_job_record(job) for job in jobs]
+        for job in jobs:
+            parts = job.get("_score_parts")
+            if parts is None:
+                parts = job._score_parts = {"relevance": 0}
+            for component in components:
+                parts[component] = score_components[component](job)
+            job.score = sum(parts.values())
+        return jobs
+    
+    def _score_components(self):
+        """Componentes del score que dependen solo de la configuración"""
+        return {
+            "salary": self.salary_points,
+            "location": self.location_points,
+            "source": self.source_points
+        }
+    
+    def salary_points(self, job):
+        """Puntos por salario según SALARY_PREFERENCES (o el salario estimado del texto si no hay otro)"""
+        salary_min = job.salary_min or (job.get("_salary_estimate") or (0, 0))[0]
+        if salary_min >= SALARY_PREFERENCES.get("target_usd", 100000):
+            return 50
+        if salary_min >= SALARY_PREFERENCES.get("preferred_usd", 60000):
+            return 30
+        if salary_min >= SALARY_PREFERENCES.get("minimum_usd", 30000):
+            return 10
+        return 0
+    
+    def location_points(self, job):
+        """Puntos por ubicación según el nivel de prioridad (PREFERRED_LOCATION_TIERS)"""
+        match = get_location_matcher().resolve(get_normalized_text(job).location)
+        return match.points if match else 0
+    
+    def source_points(self, job):
+        """Puntos fijos de la fuente (SOURCE_SCORE_PRIORS)"""
+        return SOURCE_SCORE_PRIORS.get(job.source, 0)
     
     def display_job(self, job, prefix=""):
         """Muestra información de un empleo en consola"""
@@ -750,7 +3484,101 @@ class JobSearchEngine:
 # INTERFAZ GRÁFICA
 # ============================================================================
 
+class ResultsView:
+    """Resultados en memoria detrás de la tabla: orden por columna y páginas
+
+    La tabla solo materializa las filas de la página actual; ordenar o cambiar de página trabaja
+    sobre esta lista, nunca sobre los widgets. Sin columna de orden se pagina directamente el
+    TopKRanker, que solo ordena los empleos desplazados cuando se pide una página más allá del top-K.
+    """
+
+    # Columna de la tabla -> (clave de orden, descendente por defecto)
+    SORT_KEYS = {
+        "#0": (lambda job: get_normalized_text(job).title, False),
+        "Empresa": (lambda job: get_normalized_text(job).company, False),
+        "Ubicación": (lambda job: get_normalized_text(job).location, False),
+        "Salario": (lambda job: (job.get("salary_min", 0) or 0, job.get("salary_max", 0) or 0), True),
+        "Fuente": (lambda job: str(job.get("source", "")).casefold(), False),
+        "Score": (lambda job: job.get("score", 0), True)
+    }
+
+    def __init__(self, page_size=50):
+        self.page_size = page_size
+        self.page_number = 0
+        self.sort_column = None   # None = orden del ranking
+        self.descending = True
+        self._jobs = []           # Lista en orden de ranking o TopKRanker
+        self._links = []
+        self._sorted = None       # (empleos, enlaces) ordenados por sort_column, hasta el próximo set_results
+
+    def set_results(self, jobs, links):
+        """Reemplaza los resultados (jobs: lista en orden de ranking o TopKRanker) conservando orden y página"""
+        self._jobs = jobs
+        self._links = links
+        self._sorted = None
+        self.page_number = min(self.page_number, self.page_count - 1)
+
+    def sort_by(self, column):
+        """Ordena por la columna (otro clic invierte el sentido); 'Score' descendente vuelve al ranking"""
+        if column == (self.sort_column or "Score"):
+            self.descending = not self.descending
+        else:
+            self.descending = self.SORT_KEYS[column][1]
+        self.sort_column = column
+        if column == "Score" and self.descending:
+            self.sort_column = None
+        self._sorted = None
+        self.page_number = 0
+
+    @property
+    def job_count(self):
+        return len(self._jobs)
+
+    @property
+    def row_count(self):
+        separator = 1 if self._jobs and self._links else 0
+        return len(self._jobs) + separator + len(self._links)
+
+    @property
+    def page_count(self):
+        return max(1, math.ceil(self.row_count / self.page_size))
+
+    def go_to_page(self, number):
+        self.page_number = max(0, min(number, self.page_count - 1))
+
+    def _ordered(self, limit):
+        """(empleos, enlaces) en el orden actual; los empleos al menos hasta limit"""
+        if self.sort_column is None:
+            jobs = self._jobs.ranked(limit) if isinstance(self._jobs, TopKRanker) else self._jobs
+            return jobs, self._links
+        if self._sorted is None:
+            key, _ = self.SORT_KEYS[self.sort_column]
+            jobs = self._jobs.ranked() if isinstance(self._jobs, TopKRanker) else self._jobs
+            self._sorted = (sorted(jobs, key=key, reverse=self.descending),
+                            sorted(self._links, key=key, reverse=self.descending))
+        return self._sorted
+
+    def page_rows(self):
+        """Filas de la página actual: [(tipo, posición absoluta, empleo)], tipo 'job', 'separator' o 'link'"""
+        start = self.page_number * self.page_size
+        end = start + self.page_size
+        jobs, links = self._ordered(end)
+        job_count = len(self._jobs)
+        link_start = job_count + (1 if job_count and links else 0)
+
+        rows = [("job", position, jobs[position]) for position in range(start, min(end, job_count))]
+        if job_count and links and start <= job_count < end:
+            rows.append(("separator", job_count, None))
+        rows.extend(("link", position, links[position - link_start])
+                    for position in range(max(start, link_start), min(end, link_start + len(links))))
+        return rows
+
+
 class JobSearchGUI:
+    RESULT_POLL_MS = 100        # Cada cuánto el hilo de Tk vacía la cola de resultados
+    RESULT_DRAIN_BUDGET = 0.05  # Segundos máximos por vaciado para que la interfaz siga respondiendo
+    RESULTS_PAGE_SIZE = 50      # Filas materializadas en la tabla (una página)
+
     def __init__(self, root):
         self.root = root
         self.root.title("🚀 Sistema de Búsqueda de Empleos - BIM/GIS")
@@ -759,14 +3587,25 @@ class JobSearchGUI:
         
         # Variables
         self.search_results = []
+        self.job_ranking = None  # TopKRanker de la última búsqueda (páginas más profundas bajo demanda)
+        self.job_pool = []       # Empleos puntuados antes de filtrar: permiten re-rankear sin red
+        self.search_links = []
         self.searcher = JobSearchEngine()
         self.search_running = False
         
+        # El hilo de búsqueda solo publica mensajes en esta cola; el hilo de Tk los aplica
+        self.result_queue = queue.Queue()
+        self._search_generation = 0   # Descarta mensajes de una búsqueda anterior ya detenida
+        self._search_status = ""
+        self._summary_text = "Sin resultados"
+        self.results_view = ResultsView(self.RESULTS_PAGE_SIZE)
+        
         # Cargar logo si está disponible
         self.logo_image = None
         self.load_logo()
         
         self.setup_ui()
+        self.root.after(self.RESULT_POLL_MS, self._drain_result_queue)
         
     def load_logo(self):
         """Carga el logo AGRDB si está disponible"""
@@ -872,6 +3711,7 @@ class JobSearchGUI:
         self.stop_button.pack(side='left', padx=5)
         
         ttk.Button(buttons_frame, text="🔄 Limpiar", command=self.clear_results).pack(side='left', padx=5)
+        ttk.Button(buttons_frame, text="📂 Última búsqueda", command=self.load_saved_results).pack(side='left', padx=5)
         
         # Barra de progreso
         self.progress = ttk.Progressbar(search_frame, mode='indeterminate')
@@ -884,6 +3724,15 @@ class JobSearchGUI:
         self.summary_label = ttk.Label(results_frame, text="Sin resultados", font=('Arial', 10, 'bold'))
         self.summary_label.pack(anchor='w', pady=2)
         
+        # Filtro instantáneo sobre el índice local (búsqueda mientras se escribe)
+        filter_frame = tk.Frame(results_frame)
+        filter_frame.pack(fill='x', pady=2)
+        ttk.Label(filter_frame, text="🔎 Filtrar resultados:").pack(side='left')
+        self.results_filter_entry = ttk.Entry(filter_frame, width=40)
+        self.results_filter_entry.pack(side='left', fill='x', expand=True, padx=5)
+        self.results_filter_entry.bind('<KeyRelease>', self._schedule_results_filter)
+        self._results_filter_job = None
+        
         # Lista de resultados
         self.results_tree = ttk.Treeview(
             results_frame, 
@@ -892,12 +3741,11 @@ class JobSearchGUI:
             height=10
         )
         
-        self.results_tree.heading('#0', text='Título del Empleo')
-        self.results_tree.heading('Empresa', text='Empresa')
-        self.results_tree.heading('Ubicación', text='Ubicación')
-        self.results_tree.heading('Salario', text='Salario')
-        self.results_tree.heading('Fuente', text='Fuente')
-        self.results_tree.heading('Score', text='Score')
+        # Clic en un encabezado: ordenar por esa columna (sobre los resultados en memoria)
+        self.results_headings = {'#0': 'Título del Empleo', 'Empresa': 'Empresa', 'Ubicación': 'Ubicación',
+                                 'Salario': 'Salario', 'Fuente': 'Fuente', 'Score': 'Score'}
+        for column, heading in self.results_headings.items():
+            self.results_tree.heading(column, text=heading, command=lambda column=column: self._sort_results(column))
         
         self.results_tree.column('#0', width=250)
         self.results_tree.column('Empresa', width=120)
@@ -909,10 +3757,22 @@ class JobSearchGUI:
         scrollbar = ttk.Scrollbar(results_frame, orient='vertical', command=self.results_tree.yview)
         self.results_tree.configure(yscrollcommand=scrollbar.set)
         
+        # Paginación: la tabla solo contiene las filas de la página actual
+        pager_frame = tk.Frame(results_frame)
+        pager_frame.pack(side='bottom', fill='x', pady=2)
+        self.prev_page_button = ttk.Button(pager_frame, text="◀ Anterior", command=lambda: self._change_results_page(-1))
+        self.prev_page_button.pack(side='left')
+        self.page_label = ttk.Label(pager_frame, text="")
+        self.page_label.pack(side='left', expand=True)
+        self.next_page_button = ttk.Button(pager_frame, text="Siguiente ▶", command=lambda: self._change_results_page(1))
+        self.next_page_button.pack(side='right')
+        
         self.results_tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
         
         self.results_tree.bind('<Double-1>', self.open_job_url)
+        self.results_tree.bind('<Prior>', lambda event: self._change_results_page(-1))
+        self.results_tree.bind('<Next>', lambda event: self._change_results_page(1))
         
     def create_export_tab(self):
         """Crea la pestaña de exportación"""
@@ -1128,160 +3988,294 @@ class JobSearchGUI:
         """Inicia la búsqueda"""
         if self.search_running:
             return
+        
+        # Los widgets solo se leen aquí, en el hilo de Tk
+        search_type = self.search_type.get()
+        additional_keyword = self.keyword_entry.get().strip()
+        selected_categories = [category for category, var in self.category_vars.items()
+                               if var.get() and category in JOB_CATEGORIES]  # ✅ TODOS los keywords (sin [:2])
+        if search_type != "completa" and not additional_keyword:
+            self.summary_label.configure(text="⚠️ Ingresa una palabra clave")
+            return
+        
+        self._search_generation += 1
+        self.search_results = []
+        self.job_ranking = TopKRanker()
+        self.job_pool = []
+        self.search_links = []
+        self._search_status = "🔍 Buscando..."
+        self.results_view.go_to_page(0)
+        self._update_results_ui()
             
         self.search_running = True
         self.search_button.configure(state='disabled')
         self.stop_button.configure(state='normal')
         self.progress.start()
         
-        search_thread = threading.Thread(target=self._perform_search)
+        search_thread = threading.Thread(
+            target=self._perform_search,
+            args=(self._search_generation, search_type, additional_keyword, selected_categories)
+        )
         search_thread.daemon = True
         search_thread.start()
     
-    def _perform_search(self):
-        """Realiza la búsqueda en segundo plano"""
+    def _perform_search(self, generation, search_type, additional_keyword, selected_categories):
+        """Realiza la búsqueda en segundo plano y publica los lotes puntuados en result_queue"""
+        def post(kind, payload=None):
+            self.result_queue.put((generation, kind, payload))
+        
         try:
-            self.search_results = []
-            additional_keyword = self.keyword_entry.get().strip()
+            started_at = time.time()
+            self.searcher.reset_source_guards()
+            queries = 1
             
-            if self.search_type.get() == "completa":
+            # Preparar términos de búsqueda para ranking
+            ranking_terms = []
+            
+            if search_type == "completa":
                 # Búsqueda por categorías seleccionadas - TODOS LOS KEYWORDS
-                for category, var in self.category_vars.items():
-                    if var.get() and category in JOB_CATEGORIES:
-                        keywords = JOB_CATEGORIES[category]  # ✅ TODOS los keywords (sin [:2])
-                        for keyword in keywords:
-                            if not self.search_running:
-                                break
-                            
-                            # Combinar keyword de categoría con filtro adicional
-                            search_terms = [keyword]
-                            if additional_keyword:
-                                # Buscar tanto el keyword original como la combinación
-                                combined_keyword = f"{keyword} {additional_keyword}"
-                                search_terms.extend([additional_keyword, combined_keyword])
-                            
-                            for search_term in search_terms:
-                                if not self.search_running:
-                                    break
-                                self.root.after(0, lambda k=search_term: self.summary_label.configure(text=f"🔍 Buscando: {k}..."))
-                                results = self.searcher.search_jobs(search_term)
-                                self.search_results.extend(results)
+                # Plan de consultas: cada palabra clave (y combinación) se busca una sola vez
+                plan = plan_queries(selected_categories, additional_keyword)
+                queries = len(plan.queries)
+                print(plan.summary())
+                for category in selected_categories:
+                    ranking_terms.extend(JOB_CATEGORIES[category])  # ✅ TODOS los keywords
+                
+                def report_progress(done, total, keyword):
+                    post("status", f"🔍 Buscando ({done}/{total}): {keyword}...")
+                
+                # Los enlaces no necesitan red: se muestran desde el principio
+                post("links", self.searcher.link_catalog.links_for_queries(plan.queries))
+                batches = (results for _, results in self.searcher.iter_search(
+                    plan.queries,
+                    should_continue=lambda: self.search_running and generation == self._search_generation,
+                    on_progress=report_progress
+                ))
             else:
                 # Búsqueda solo por palabra clave específica
-                if additional_keyword:
-                    self.root.after(0, lambda: self.summary_label.configure(text=f"🔍 Buscando: {additional_keyword}..."))
-                    results = self.searcher.search_jobs(additional_keyword)
-                    self.search_results.extend(results)
-                else:
-                    self.root.after(0, lambda: self.summary_label.configure(text="⚠️ Ingresa una palabra clave"))
-                    return
+                post("status", f"🔍 Buscando: {additional_keyword}...")
+                post("links", list(self.searcher.search_links(additional_keyword)))
+                batches = [self.searcher.search_keyword(additional_keyword)]
+            if additional_keyword:
+                ranking_terms.append(additional_keyword)
             
-            # Procesar resultados
-            if self.search_results:
-                search_link_sources = ['LinkedIn (Remote)', 'LinkedIn', 'Indeed (Remote)', 'Indeed (Salary)', 'WeWorkRemotely', 'AngelList']
-                real_jobs = [job for job in self.search_results if job.get('source') not in search_link_sources]
-                search_links = [job for job in self.search_results if job.get('source') in search_link_sources]
-                
-                if real_jobs:
-                    real_jobs = self.searcher.remove_duplicates(real_jobs)
-                    real_jobs = self.searcher.apply_filters(real_jobs)
-                    
-                    # Preparar términos de búsqueda para ranking
-                    ranking_terms = []
-                    if self.search_type.get() == "completa":
-                        # Incluir palabras clave de categorías seleccionadas
-                        for category, var in self.category_vars.items():
-                            if var.get() and category in JOB_CATEGORIES:
-                                ranking_terms.extend(JOB_CATEGORIES[category])  # ✅ TODOS los keywords
-                    if additional_keyword:
-                        ranking_terms.append(additional_keyword)
-                    
-                    real_jobs = self.searcher.rank_jobs(real_jobs, ranking_terms if ranking_terms else None)
-                
-                self.search_results = real_jobs + search_links
+            # Deduplicado y puntuación en streaming: cada lote se publica en cuanto está listo.
+            # Se puntúa antes de filtrar para que un cambio de filtros no exija rehacer la relevancia
+            ranked_jobs = []
+            for batch in self.searcher.iter_scored(self.searcher.iter_unique(batches), ranking_terms or None):
+                filtered = self.searcher.apply_filters(batch)
+                ranked_jobs.extend(filtered)
+                post("jobs", (batch, filtered))
             
-            self.root.after(0, self._update_results_ui)
+            if ranked_jobs:
+                self.searcher.persist_results(ranked_jobs, search_type, queries, started_at)
             
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Error: {e}"))
+            post("error", str(e))
         finally:
-            self.root.after(0, self._search_completed)
+            post("done")
     
-    def _update_results_ui(self):
-        """Actualiza la interfaz con los resultados"""
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+    def _drain_result_queue(self):
+        """Aplica en el hilo de Tk los mensajes del hilo de búsqueda y refresca la tabla por lotes"""
+        deadline = time.perf_counter() + self.RESULT_DRAIN_BUDGET
+        changed = False
+        completed = False
+        try:
+            while time.perf_counter() < deadline:
+                generation, kind, payload = self.result_queue.get_nowait()
+                if generation != self._search_generation:
+                    continue  # Búsqueda anterior detenida
+                if kind == "jobs":
+                    pool_batch, ranked_batch = payload
+                    if self.job_ranking is None:  # Limpiado durante la búsqueda
+                        self.job_ranking = TopKRanker()
+                    self.job_pool.extend(pool_batch)
+                    self.job_ranking.extend(ranked_batch)
+                    changed = True
+                elif kind == "links":
+                    self.search_links = payload
+                    changed = True
+                elif kind == "status":
+                    self._search_status = payload
+                    self._refresh_summary()
+                elif kind == "error":
+                    messagebox.showerror("Error", f"Error: {payload}")
+                elif kind == "done":
+                    completed = True
+        except queue.Empty:
+            pass
+        
+        if completed:
+            self._search_status = ""
+        if changed or completed:
+            top_jobs = self.job_ranking.top() if self.job_ranking is not None else []
+            self.search_results = top_jobs + self.search_links
+            self._update_results_ui()
+        if completed:
+            self._search_completed()
+        self.root.after(self.RESULT_POLL_MS, self._drain_result_queue)
+    
+    def _schedule_results_filter(self, event=None):
+        """Aplica el filtro 150 ms después de la última tecla"""
+        if self._results_filter_job is not None:
+            self.root.after_cancel(self._results_filter_job)
+        self.results_view.go_to_page(0)
+        self._results_filter_job = self.root.after(150, self._update_results_ui)
+    
+    def _visible_results(self):
+        """Resultados que cumplen el filtro escrito en la pestaña de resultados"""
+        self._results_filter_job = None
+        query = self.results_filter_entry.get().strip()
+        if not query:
+            return self.search_results
         
-        search_link_sources = ['LinkedIn (Remote)', 'LinkedIn', 'Indeed (Remote)', 'Indeed (Salary)', 'WeWorkRemotely', 'AngelList']
-        real_jobs = [job for job in self.search_results if job.get('source') not in search_link_sources]
-        search_links = [job for job in self.search_results if job.get('source') in search_link_sources]
+        matching = self.searcher.index.search_fingerprints(query, as_you_type=True)
+        query_folded = fold_text(query.replace('"', '').rstrip('*'))
+        return [job for job in self._all_results()
+                if job_fingerprint(job) in matching or query_folded in get_normalized_text(job).title]
+    
+    def _all_results(self):
+        """Todos los resultados en orden de ranking (ordena más allá del top-K solo al pedirlo)"""
+        if self.job_ranking is None:
+            return self.search_results
+        return self.job_ranking.ranked() + self.search_links
+    
+    def _update_results_ui(self):
+        """Actualiza el resumen y la página visible de la tabla con los resultados"""
+        visible_results = self._visible_results()
+        if visible_results is self.search_results and self.job_ranking is not None:
+            # Sin filtro se pagina el ranking completo (se ordena solo lo que se llega a ver)
+            real_jobs = self.job_ranking
+            search_links = self.search_links
+            with_salary = len([job for job in self.job_ranking.jobs() if job.get('salary_min', 0) > 0])
+        else:
+            real_jobs = [job for job in visible_results if not is_search_link(job)]
+            search_links = [job for job in visible_results if is_search_link(job)]
+            with_salary = len([job for job in real_jobs if job.get('salary_min', 0) > 0])
         
-        total_jobs = len(self.search_results)
         real_count = len(real_jobs)
         links_count = len(search_links)
-        with_salary = len([job for job in real_jobs if job.get('salary_min', 0) > 0])
-        
-        self.summary_label.configure(text=f"📊 {total_jobs} resultados • {real_count} empleos reales • {links_count} enlaces • {with_salary} con salario")
-        
-        # Empleos reales
-        for i, job in enumerate(real_jobs[:20], 1):
-            salary_text = ""
-            if job.get('salary_min', 0) > 0:
-                salary_text = f"${job['salary_min']:,}"
-                if job.get('salary_max', 0) > 0:
-                    salary_text += f"-${job['salary_max']:,}"
-            
-            title_with_icon = f"💼 {job.get('title', 'N/A')}"
-            
-            self.results_tree.insert('', 'end',
-                text=f"{i}. {title_with_icon}",
-                values=(
-                    job.get('company', 'N/A'),
-                    job.get('location', 'N/A'),
-                    salary_text,
-                    job.get('source', 'N/A'),
-                    f"⭐{job.get('score', 0)}"
-                ),
-                tags=(job.get('url', ''), 'real_job')
-            )
-        
-        # Separador
-        if real_jobs and search_links:
-            self.results_tree.insert('', 'end',
-                text="─── 🔗 ENLACES DE BÚSQUEDA ───",
-                values=("", "", "", "", ""),
-                tags=("", 'separator')
-            )
+        total_jobs = real_count + links_count
+        self._summary_text = f"📊 {total_jobs} resultados • {real_count} empleos reales • {links_count} enlaces • {with_salary} con salario"
+        self._refresh_summary()
         
-        # Enlaces de búsqueda
-        link_start = len(real_jobs) + (1 if real_jobs and search_links else 0)
-        for i, link in enumerate(search_links[:10], link_start + 1):
-            icon = "🔗"
-            if "LinkedIn" in link.get('source', ''):
-                icon = "💼"
-            elif "Indeed" in link.get('source', ''):
-                icon = "🔍"
-            elif "Remote" in link.get('source', ''):
-                icon = "🏠"
-            
-            title_with_icon = f"{icon} {link.get('title', 'N/A')}"
-            
-            self.results_tree.insert('', 'end',
-                text=f"{i}. {title_with_icon}",
-                values=(
-                    link.get('company', 'N/A'),
-                    link.get('location', 'N/A'),
-                    "Haz clic para buscar",
-                    link.get('source', 'N/A'),
-                    f"🔗{link.get('score', 0)}"
-                ),
-                tags=(link.get('url', ''), 'search_link')
-            )
+        self.results_view.set_results(real_jobs, search_links)
+        self._render_results_page()
+    
+    def _render_results_page(self):
+        """Materializa en la tabla solo las filas de la página actual"""
+        rows = []
+        for kind, position, job in self.results_view.page_rows():
+            if kind == "separator":
+                rows.append(("separator", "─── 🔗 ENLACES DE BÚSQUEDA ───", ("", "", "", "", ""), ("", 'separator')))
+            elif kind == "job":
+                rows.append(self._job_row(position + 1, job))
+            else:
+                rows.append(self._link_row(position + 1, job))
+        self._sync_tree_rows(rows)
         
         # Colores
         self.results_tree.tag_configure('real_job', background='#e8f5e8')
         self.results_tree.tag_configure('search_link', background='#e8f0ff')
         self.results_tree.tag_configure('separator', background='#f0f0f0', font=('Arial', 9, 'bold'))
+        
+        view = self.results_view
+        first_row = view.page_number * view.page_size
+        self.page_label.configure(text=f"Página {view.page_number + 1} de {view.page_count} • filas "
+                                       f"{min(first_row + 1, view.row_count)}-{min(first_row + view.page_size, view.row_count)} de {view.row_count}")
+        self.prev_page_button.configure(state='normal' if view.page_number > 0 else 'disabled')
+        self.next_page_button.configure(state='normal' if view.page_number < view.page_count - 1 else 'disabled')
+        
+        for column, heading in self.results_headings.items():
+            arrow = ""
+            if column == (view.sort_column or "Score"):
+                arrow = " ▼" if view.descending else " ▲"
+            self.results_tree.heading(column, text=f"{heading}{arrow}")
+    
+    def _job_row(self, number, job):
+        """Fila (iid, texto, valores, tags) de un empleo real"""
+        salary_text = ""
+        if job.get('salary_min', 0) > 0:
+            salary_text = f"${job['salary_min']:,}"
+            if job.get('salary_max', 0) > 0:
+                salary_text += f"-${job['salary_max']:,}"
+        
+        title_with_icon = f"💼 {job.get('title', 'N/A')}"
+        
+        return (
+            f"job-{id(job)}",
+            f"{number}. {title_with_icon}",
+            (
+                job.get('company', 'N/A'),
+                job.get('location', 'N/A'),
+                salary_text,
+                job.get('source', 'N/A'),
+                f"⭐{job.get('score', 0)}"
+            ),
+            (job.get('url', ''), 'real_job')
+        )
+    
+    def _link_row(self, number, link):
+        """Fila (iid, texto, valores, tags) de un enlace de búsqueda"""
+        icon = "🔗"
+        if "LinkedIn" in link.get('source', ''):
+            icon = "💼"
+        elif "Indeed" in link.get('source', ''):
+            icon = "🔍"
+        elif "Remote" in link.get('source', ''):
+            icon = "🏠"
+        
+        title_with_icon = f"{icon} {link.get('title', 'N/A')}"
+        
+        return (
+            f"link-{id(link)}",
+            f"{number}. {title_with_icon}",
+            (
+                link.get('company', 'N/A'),
+                link.get('location', 'N/A'),
+                "Haz clic para buscar",
+                link.get('source', 'N/A'),
+                f"🔗{link.get('score', 0)}"
+            ),
+            (link.get('url', ''), 'search_link')
+        )
+    
+    def _sort_results(self, column):
+        """Ordena los resultados por la columna pulsada y vuelve a la primera página"""
+        self.results_view.sort_by(column)
+        self._render_results_page()
+        self.results_tree.yview_moveto(0)
+    
+    def _change_results_page(self, step):
+        """Avanza o retrocede una página de resultados"""
+        view = self.results_view
+        page_number = view.page_number
+        view.go_to_page(page_number + step)
+        if view.page_number != page_number:
+            self._render_results_page()
+            self.results_tree.yview_moveto(0)
+        return "break"
+    
+    def _sync_tree_rows(self, rows):
+        """Deja en la tabla exactamente rows [(iid, texto, valores, tags)] tocando solo lo que cambia"""
+        tree = self.results_tree
+        wanted = {iid for iid, _, _, _ in rows}
+        stale = [iid for iid in tree.get_children() if iid not in wanted]
+        if stale:
+            tree.delete(*stale)
+        
+        for index, (iid, text, values, tags) in enumerate(rows):
+            if not tree.exists(iid):
+                tree.insert('', index, iid=iid, text=text, values=values, tags=tags)
+                continue
+            if tree.index(iid) != index:
+                tree.move(iid, '', index)
+            tree.item(iid, text=text, values=values, tags=tags)
+    
+    def _refresh_summary(self):
+        """Resumen de resultados más el estado de la búsqueda en curso"""
+        status = f" • {self._search_status}" if self._search_status else ""
+        self.summary_label.configure(text=f"{self._summary_text}{status}")
     
     def _search_completed(self):
         """Finaliza la búsqueda"""
@@ -1294,9 +4288,27 @@ class JobSearchGUI:
         """Detiene la búsqueda"""
         self.search_running = False
     
+    def load_saved_results(self):
+        """Carga el ranking de la última búsqueda guardada en el almacén SQLite (sin red)"""
+        if self.search_running:
+            return
+        saved_jobs = self.searcher.load_results()
+        if not saved_jobs:
+            messagebox.showinfo("Sin resultados", "No hay búsquedas guardadas")
+            return
+        self.job_pool = saved_jobs
+        self.search_links = []
+        self.job_ranking = TopKRanker().extend(self.searcher.apply_filters(self.job_pool))
+        self.search_results = self.job_ranking.top()
+        self.results_view.go_to_page(0)
+        self._update_results_ui()
+    
     def clear_results(self):
         """Limpia los resultados"""
         self.search_results = []
+        self.job_ranking = None
+        self.job_pool = []
+        self.search_links = []
         self._update_results_ui()
         self.preview_text.delete(1.0, tk.END)
     
@@ -1340,7 +4352,7 @@ class JobSearchGUI:
     
     def _export_to_file(self, filename, format_type):
         """Exporta los resultados al archivo"""
-        results_to_export = self.search_results
+        results_to_export = self._all_results()
         if self.filter_by_salary.get():
             results_to_export = [job for job in results_to_export if job.get('salary_min', 0) > 0]
         
@@ -1349,7 +4361,7 @@ class JobSearchGUI:
                 export_data = {
                     'exported_at': datetime.now().isoformat(),
                     'total_jobs': len(results_to_export),
-                    'jobs': results_to_export
+                    'jobs': [export_view(job) for job in results_to_export]
                 }
                 json.dump(export_data, f, indent=2, ensure_ascii=False)
         
@@ -1374,7 +4386,7 @@ class JobSearchGUI:
             jobs_element = ET.SubElement(root, 'jobs')
             for job in results_to_export:
                 job_element = ET.SubElement(jobs_element, 'job')
-                for key, value in job.items():
+                for key, value in export_view(job).items():
                     if key != 'description' or self.include_description.get():
                         ET.SubElement(job_element, key).text = str(value)
             
@@ -1479,7 +4491,7 @@ class JobSearchGUI:
         self.preview_text.delete(1.0, tk.END)
         
         if format_type == 'json':
-            preview_content = json.dumps(preview_data, indent=2, ensure_ascii=False)
+            preview_content = json.dumps([export_view(job) for job in preview_data], indent=2, ensure_ascii=False)
         elif format_type == 'csv':
             preview_content = "title,company,location,salary_min,salary_max,source,url,score\n"
             for job in preview_data:
@@ -1507,13 +4519,32 @@ class JobSearchGUI:
         """Guarda la configuración"""
         try:
             global SALARY_PREFERENCES, SEARCH_FILTERS
+            previous_salary = dict(SALARY_PREFERENCES)
+            previous_filters = dict(SEARCH_FILTERS)
             SALARY_PREFERENCES['minimum_usd'] = int(self.min_salary.get())
             SALARY_PREFERENCES['preferred_usd'] = int(self.pref_salary.get())
             SEARCH_FILTERS['remote_only'] = self.remote_only.get()
             SEARCH_FILTERS['exclude_agencies'] = self.exclude_agencies.get()
+            
+            # Re-rankear los resultados actuales sin volver a buscar
+            changed_components = ["salary"] if SALARY_PREFERENCES != previous_salary else []
+            if changed_components or SEARCH_FILTERS != previous_filters:
+                self._rerank_results(changed_components)
             messagebox.showinfo("Configuración", "Configuración guardada")
         except ValueError:
             messagebox.showerror("Error", "Los salarios deben ser números")
+    
+    def _rerank_results(self, components):
+        """Recalcula los componentes de score indicados, vuelve a filtrar el pool y reordena"""
+        if not self.job_pool or self.search_running:
+            return
+        if components:
+            self.searcher.rescore_jobs(self.job_pool, components)
+        self.job_ranking = TopKRanker().extend(self.searcher.apply_filters(self.job_pool))
+        self.search_results = self.job_ranking.top() + self.search_links
+        self._update_results_ui()
+
+
 # ============================================================================
 # MODO CONSOLA
 # ============================================================================
@@ -1534,12 +4565,14 @@ def console_mode():
     print("1. Búsqueda completa en todas las categorías (ÚLTIMAS VACANTES)")
     print("2. Búsqueda por palabra clave específica (ÚLTIMAS VACANTES)")
     print("3. 🖥️ Abrir interfaz gráfica")
+    print("4. Solo empleos NUEVOS desde la última ejecución")
+    print("5. 🗄️ Consultar empleos guardados (sin conexión)")
     
-    choice = input("\nSelección (1-3): ").strip()
+    choice = input("\nSelección (1-5): ").strip()
     
     if choice == "1":
         all_results = searcher.search_all_categories()
-        top_jobs = searcher.rank_jobs(all_results)[:10]
+        top_jobs = TopKRanker(10).extend(all_results).top()  # Ya puntuados: no se vuelve a rankear
         print(f"\n🏆 TOP 10 EMPLEOS RECOMENDADOS:")
         for i, job in enumerate(top_jobs, 1):
             searcher.display_job(job, f"#{i}")
@@ -1547,20 +4580,63 @@ def console_mode():
     elif choice == "2":
         keyword = input("Ingresa la palabra clave: ").strip()
         if keyword:
-            results = searcher.search_jobs(keyword)
-            filtered_results = searcher.apply_filters(results)
-            ranked_results = searcher.rank_jobs(filtered_results, [keyword])
+            ranked_results = TopKRanker(5)
+            batches = searcher.iter_filters(searcher.iter_unique([searcher.search_keyword(keyword)]))
+            for batch in searcher.iter_scored(batches, [keyword]):
+                ranked_results.extend(batch)
             
             print(f"\n📊 {len(ranked_results)} empleos encontrados para '{keyword}'")
-            for i, job in enumerate(ranked_results[:5], 1):
+            for i, job in enumerate(ranked_results.top(), 1):
                 searcher.display_job(job, f"#{i}")
+            
+            search_links = searcher.search_links(keyword)
+            print(f"\n🔗 {len(search_links)} enlaces de búsqueda para '{keyword}':")
+            for link in search_links[:3]:
+                print(f"   • {link['title']}: {link['url']}")
                 
     elif choice == "3":
         gui_mode()
         
+    elif choice == "4":
+        new_jobs_mode()
+        
+    elif choice == "5":
+        saved_jobs_mode(searcher)
+        
     else:
         print("❌ Selección inválida")
 
+def saved_jobs_mode(searcher):
+    """Consulta el almacén SQLite: ranking de la última ejecución o búsqueda de texto en todo lo guardado"""
+    if searcher.job_store is None:
+        print("❌ El almacén de resultados está desactivado (JOB_STORE_SETTINGS)")
+        return
+    
+    for run in searcher.saved_runs(limit=5):
+        started = datetime.fromtimestamp(run["started_at"]).strftime("%Y-%m-%d %H:%M") if run["started_at"] else "?"
+        print(f"   #{run['id']} {started} • {run['mode']} • {run['jobs']} empleos ({run['new_jobs']} nuevos)")
+    
+    query = input("\nTexto a buscar (vacío = última ejecución): ").strip()
+    if query:
+        saved_jobs = searcher.search_saved(query, limit=10)
+        print(f"\n🗄️ {len(saved_jobs)} empleos guardados para '{query}':")
+    else:
+        saved_jobs = searcher.load_results(limit=10)
+        print(f"\n🗄️ TOP {len(saved_jobs)} DE LA ÚLTIMA EJECUCIÓN:")
+    for i, job in enumerate(saved_jobs, 1):
+        searcher.display_job(job, f"#{i}")
+
+def new_jobs_mode():
+    """Barrido completo que muestra solo los empleos no vistos en ejecuciones anteriores"""
+    searcher = JobSearchEngine(incremental=True)
+    all_results = searcher.search_all_categories()
+    new_jobs = searcher.filter_new_jobs(all_results)
+    searcher.commit_seen_jobs()
+    
+    print(f"\n🆕 {len(new_jobs)} EMPLEOS NUEVOS DESDE LA ÚLTIMA EJECUCIÓN")
+    for i, job in enumerate(TopKRanker(len(new_jobs)).extend(new_jobs).top(), 1):
+        searcher.display_job(job, f"#{i}")
+
 # ============================================================================
 # MODO GUI
 # ============================================================================
@@ -1576,6 +4652,204 @@ def gui_mode():
         print("Ejecutando en modo consola...")
         console_mode()
 
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def _measure(function, trace_memory=True):
+    """Ejecuta function() y devuelve (resultado, segundos, pico de memoria en MB)
+
+    tracemalloc ralentiza el código con muchas asignaciones: usar trace_memory=False para medir solo tiempo.
+    """
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def _synthetic_remoteok_payload(n_jobs):
+    """Feed con la forma del de RemoteOK (metadata + empleos) para medir sin red"""
+    now = int(time.time())
+    jobs = [{"legal": "API Terms of Service"}]
+    for i in range(n_jobs):
+        posted_at = now - i * 300  # Con 5000 empleos cubre ~17 días: el corte de antigüedad descarta parte
+        jobs.append({
+            "id": i,
+            "epoch": posted_at,
+            "date": datetime.fromtimestamp(posted_at, timezone.utc).isoformat(),  # ISO, como el feed real
+            "position": "BIM Coordinator" if i % 20 == 0 else f"Software Engineer {i}",
+            "company": f"Company {i % 300}",
+            "location": "Remote",
+            "description": "<p>" + "Revit Dynamo Python coordination workflows. " * 60 + "</p>",
+            "tags": ["bim", "revit", "python"]
+        })
+    return json.dumps(jobs).encode("utf-8")
+
+
+def benchmark_remoteok_parsing(searcher, n_jobs=5000):
+    """Carga del snapshot de RemoteOK (_snapshot_loader) con response.json() contra streaming"""
+    payload = _synthetic_remoteok_payload(n_jobs)
+    
+    def response(source, url, **kwargs):
+        fake = requests.Response()
+        fake.status_code = 200
+        fake.raw = io.BytesIO(payload)
+        return fake
+    
+    load = searcher._snapshot_loader(RemoteOKAdapter(searcher))
+    streaming = ENGINE_SETTINGS.get("remoteok_streaming", True)
+    searcher._source_get = response  # Feed sintético en lugar de la red
+    
+    print(f"\n📏 Carga del feed RemoteOK ({n_jobs} empleos, {len(payload) / (1024 * 1024):.1f} MB)")
+    try:
+        for label, enabled in (("response.json()", False), ("streaming", True)):
+            ENGINE_SETTINGS["remoteok_streaming"] = enabled
+            records, elapsed, peak_mb = _measure(load)
+            print(f"   {label:<16} {elapsed * 1000:8.1f} ms • pico {peak_mb:7.1f} MB • {len(records)} empleos recientes")
+    finally:
+        ENGINE_SETTINGS["remoteok_streaming"] = streaming
+        del searcher._source_get
+
+
+def benchmark_keyword_matching(searcher, n_jobs=2000):
+    """Barrido de todos los términos: is_relevant_job por palabra clave contra normalizar una vez + Aho-Corasick"""
+    jobs = json.loads(_synthetic_remoteok_payload(n_jobs))[1:]
+    keywords = list(dict.fromkeys(term for terms in JOB_CATEGORIES.values() for term in terms))
+    
+    def per_keyword():
+        return sum(1 for keyword in keywords for job in jobs if searcher.is_relevant_job(job, keyword))
+    
+    def automaton():
+        adapter = RemoteOKAdapter(searcher)
+        term_index = searcher.index_category_terms([adapter.ingest(job) for job in jobs])
+        return sum(len(term_index.get(get_category_matcher().term_ids[keyword.lower()], [])) for keyword in keywords)
+    
+    print(f"\n📏 Coincidencia de {len(keywords)} términos sobre {n_jobs} empleos")
+    for label, function in (("por keyword", per_keyword), ("ingesta + índice", automaton)):
+        matches, elapsed, _ = _measure(function, trace_memory=False)
+        print(f"   {label:<16} {elapsed * 1000:8.1f} ms • {matches} coincidencias")
+
+
+def benchmark_relevance_ranking(searcher, n_jobs=10000):
+    """BM25Scorer en Python puro contra la versión vectorizada con NumPy (frecuencias ya cacheadas)"""
+    adapter = RemoteOKAdapter(searcher)
+    records = [adapter.ingest(job) for job in json.loads(_synthetic_remoteok_payload(n_jobs))[1:]]
+    for record in records:
+        get_term_counts(record)  # Se calcula una vez en la ingesta (índice del snapshot)
+    terms = [term for terms in JOB_CATEGORIES.values() for term in terms]
+    
+    scorer = BM25Scorer(terms)
+    backends = [("BM25 (Python)", lambda: scorer._score_python(len(records), *scorer._entries(records)))]
+    if NUMPY_AVAILABLE:
+        backends.append(("BM25 (NumPy)", lambda: scorer._score_numpy(len(records), *scorer._entries(records))))
+    
+    print(f"\n📏 Relevancia de {n_jobs} empleos contra {len(terms)} términos")
+    for label, function in backends:
+        _, elapsed, _ = _measure(function, trace_memory=False)
+        print(f"   {label:<16} {elapsed * 1000:8.1f} ms")
+
+
+def benchmark_top_k(n_jobs=100000, k=10):
+    """Orden completo contra montículo top-K sobre empleos ya puntuados"""
+    jobs = [{"score": random.randint(0, 200)} for _ in range(n_jobs)]
+    
+    print(f"\n🏆 Top {k} de {n_jobs} empleos puntuados")
+    for label, function in (("sorted completo", lambda: sorted(jobs, key=lambda x: x.get("score", 0), reverse=True)[:k]),
+                            ("TopKRanker", lambda: TopKRanker(k, keep_overflow=False).extend(jobs).top())):
+        _, elapsed, _ = _measure(function, trace_memory=False)
+        _, _, peak = _measure(function)
+        print(f"   {label:<16} {elapsed * 1000:8.1f} ms   pico {peak * 1024:8.1f} KB")
+
+
+def benchmark_salary_extraction(n_jobs=10000):
+    """Etapa de extracción de salarios sobre descripciones con y sin salario en texto"""
+    descriptions = [
+        "<p>Revit Dynamo Python coordination workflows. " * 40 + "Salario: COP 8.000.000/mes</p>",
+        "<p>GIS analyst, ArcGIS and QGIS. Pay: $45/hr, contract role.</p>",
+        "<p>BIM Manager, €60k-€75k plus benefits. " * 10 + "</p>",
+        "<p>" + "Revit Dynamo Python coordination workflows. " * 60 + "</p>"
+    ]
+    records = [{"title": f"Engineer {i}", "salary_min": 0, "salary_max": 0,
+                "_text": build_normalized_text(f"Engineer {i}", "Company", "Remote", descriptions[i % len(descriptions)])}
+               for i in range(n_jobs)]
+    extractor = get_salary_extractor()
+    
+    found, elapsed, _ = _measure(lambda: extractor.annotate(records), trace_memory=False)
+    print(f"\n💰 Extracción de salarios en {n_jobs} empleos")
+    print(f"   {found} salarios encontrados en {elapsed * 1000:.1f} ms")
+
+
+def benchmark_near_duplicates(searcher, n_jobs=10000, n_duplicates=500):
+    """Firmas MinHash y agrupación LSH sobre empleos distintos más copias sindicadas con cambios menores"""
+    rng = random.Random(7)
+    vocabulary = [f"term{i}" for i in range(5000)]
+    jobs = []
+    for i in range(n_jobs + n_duplicates):
+        original = i < n_jobs
+        base = i if original else rng.randrange(n_jobs)
+        words = random.Random(base).choices(vocabulary, k=150)
+        if not original:
+            words[rng.randrange(len(words))] = "syndicated"
+        title = f"BIM Engineer {base}" + ("" if original else " (Remote)")
+        jobs.append({"title": title, "company": f"Company {base % 300}", "url": f"https://example.com/{i}",
+                     "source": "RemoteOK" if original else "The Muse", "salary_min": 0,
+                     "_text": build_normalized_text(title, f"Company {base % 300}", "Remote", " ".join(words))})
+    detector = get_near_duplicate_detector()
+    
+    print(f"\n🧬 Casi-duplicados en {len(jobs)} empleos ({n_duplicates} copias)")
+    _, elapsed, _ = _measure(lambda: detector.signatures(jobs), trace_memory=False)
+    print(f"   firmas MinHash   {elapsed * 1000:8.1f} ms")
+    unique, elapsed, _ = _measure(lambda: searcher.remove_near_duplicates(jobs), trace_memory=False)
+    print(f"   agrupación LSH   {elapsed * 1000:8.1f} ms   {len(jobs) - len(unique)} fusionados")
+
+
+def benchmark_job_records(searcher, n_jobs=10000):
+    """Memoria retenida por empleo y lecturas de los bucles de filtro/ranking: dict contra JobRecord"""
+    payload = _synthetic_remoteok_payload(n_jobs)
+    adapter = RemoteOKAdapter(searcher)
+
+    def as_dict(job):
+        # Forma anterior de RemoteOKAdapter.normalize (cadenas sin internar)
+        return {"title": job.get("position", "N/A"), "company": job.get("company", "N/A"),
+                "location": job.get("location", "Remote"), "salary_min": job.get("salary_min", 0),
+                "salary_max": job.get("salary_max", 0), "url": f"https://remoteok.io/remote-jobs/{job.get('id', '')}",
+                "description": str(job.get("description", ""))[:200], "source": adapter.display_name, "score": 0}
+    builders = (("dict", as_dict), ("JobRecord", adapter.normalize))
+
+    print(f"\n🧱 Registros de {n_jobs} empleos normalizados")
+    for label, build in builders:
+        tracemalloc.start()
+        jobs = [build(job) for job in json.loads(payload)[1:]]
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        if label == "dict":
+            reads = lambda: sum(1 for job in jobs if job.get("salary_min", 0) >= 0 and job.get("source") and job.get("score", 0) >= 0)
+        else:
+            reads = lambda: sum(1 for job in jobs if job.salary_min >= 0 and job.source and job.score >= 0)
+        _, elapsed, _ = _measure(lambda: [reads() for _ in range(20)], trace_memory=False)
+        print(f"   {label:<10} {retained / n_jobs:7.0f} B/empleo • lecturas filtro/ranking {elapsed * 1000 / 20:6.2f} ms")
+
+
+def run_benchmarks():
+    """Mide las rutas críticas del motor con datos sintéticos (sin red)"""
+    print("📏 BENCHMARKS DEL MOTOR DE BÚSQUEDA")
+    print("=" * 60)
+    searcher = JobSearchEngine()
+    benchmark_job_records(searcher)
+    benchmark_remoteok_parsing(searcher)
+    benchmark_keyword_matching(searcher)
+    benchmark_relevance_ranking(searcher)
+    benchmark_top_k()
+    benchmark_salary_extraction()
+    benchmark_near_duplicates(searcher)
+
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -1585,12 +4859,18 @@ def main():
     if len(sys.argv) > 1:
         if sys.argv[1] == "--console":
             console_mode()
+        elif sys.argv[1] == "--new-only":
+            new_jobs_mode()
+        elif sys.argv[1] == "--benchmark":
+            run_benchmarks()
         elif sys.argv[1] == "--help":
             print("🚀 Sistema de Búsqueda de Empleos")
             print("\nUso:")
-            print("  python job_search_bim.py           - Interfaz gráfica")
-            print("  python job_search_bim.py --console - Modo consola")
-            print("  python job_search_bim.py --help    - Esta ayuda")
+            print("  python job_search_bim.py             - Interfaz gráfica")
+            print("  python job_search_bim.py --console   - Modo consola")
+            print("  python job_search_bim.py --new-only  - Solo empleos nuevos desde la última ejecución")
+            print("  python job_search_bim.py --benchmark - Medir rendimiento del motor (sin red)")
+            print("  python job_search_bim.py --help      - Esta ayuda")
         else:
             print(f"❌ Argumento desconocido: {sys.argv[1]}")
     else:
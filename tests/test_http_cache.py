@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas sin red de HttpResponseCache/CachedSession contra un servidor HTTP local (http.server)
+
+Uso: python -m unittest discover tests
+"""
+
+import gzip
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_search_bim import CachedSession, HttpResponseCache
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """Sirve un cuerpo por ruta con ETag y responde 304 si el cliente envía el mismo ETag"""
+
+    bodies = {}
+    requests_seen = []
+
+    def do_GET(self):
+        body = self.bodies[self.path]
+        etag = f'"{len(body)}-{self.path}"'
+        self.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpResponseCacheTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        StubHandler.requests_seen.clear()
+        StubHandler.bodies = {f"/job{i}": os.urandom(2000) for i in range(3)}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def session(self, max_bytes=1024 * 1024, ttl=600):
+        return CachedSession(HttpResponseCache(self.directory.name, max_bytes, ttl))
+
+    def test_gzip_round_trip(self):
+        session = self.session()
+        url = f"{self.base_url}/job0"
+        first = session.get(url)
+        second = session.get(url)
+
+        self.assertEqual(first.content, StubHandler.bodies["/job0"])
+        self.assertEqual(second.content, StubHandler.bodies["/job0"])
+        self.assertTrue(second.from_cache)
+        self.assertEqual(len(StubHandler.requests_seen), 1)
+        with gzip.open(session.cache._paths(url)[1], "rb") as f:
+            self.assertEqual(f.read(), StubHandler.bodies["/job0"])
+
+    def test_etag_revalidation(self):
+        session = self.session(ttl=0)  # Toda entrada caducada: siempre se revalida
+        url = f"{self.base_url}/job1"
+        session.get(url)
+        revalidated = session.get(url)
+
+        self.assertEqual(StubHandler.requests_seen[1], ("/job1", '"2000-/job1"'))
+        self.assertEqual(revalidated.content, StubHandler.bodies["/job1"])
+        self.assertEqual(session.cache.stats["revalidated"], 1)
+
+    def test_lru_eviction(self):
+        session = self.session(max_bytes=5000)  # Caben dos cuerpos de 2000 bytes (aleatorios: no comprimen)
+        urls = [f"{self.base_url}/job{i}" for i in range(3)]
+        session.get(urls[0])
+        time.sleep(0.02)
+        session.get(urls[1])
+        time.sleep(0.02)
+        session.get(urls[0])  # Acierto: job0 pasa a ser el usado más recientemente
+        time.sleep(0.02)
+        session.get(urls[2])
+
+        cache = session.cache
+        self.assertIsNotNone(cache.lookup(urls[0]))
+        self.assertIsNone(cache.lookup(urls[1]))
+        self.assertIsNotNone(cache.lookup(urls[2]))
+        self.assertEqual(cache.stats["evictions"], 1)
+
+    def test_streaming_tee(self):
+        session = self.session()
+        url = f"{self.base_url}/job2"
+
+        partial = session.get(url, stream=True)
+        next(partial.iter_content(100))
+        partial.close()
+        self.assertIsNone(session.cache.lookup(url))  # Cuerpo incompleto: no se guarda
+
+        streamed = session.get(url, stream=True)
+        self.assertEqual(b"".join(streamed.iter_content(256)), StubHandler.bodies["/job2"])
+        cached = session.get(url, stream=True)
+        self.assertTrue(cached.from_cache)
+        self.assertEqual(b"".join(cached.iter_content(256)), StubHandler.bodies["/job2"])
+
+
+if __name__ == "__main__":
+    unittest.main()